@@ -3,7 +3,7 @@ from fastapi.responses import JSONResponse
 from loguru import logger
 from langgraph.graph.state import CompiledStateGraph
 
-from megamind.clients.titan_client import TitanClient
+from megamind.clients.titan_client import get_titan_client
 from megamind.models.requests import (
     DocumentExtractionRequest,
     TitanCallbackRequest,
@@ -31,7 +31,7 @@ async def submit_document_extraction(
         callback_url = "/api/v1/document-extraction/callback"
 
         # Initialize Titan client and submit documents
-        titan_client = TitanClient()
+        titan_client = get_titan_client()
         job_id = await titan_client.submit_documents(
             file_names=request_data.file_names,
             callback_url=callback_url,
@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import lru_cache
 from fastapi import APIRouter, Request, HTTPException
 from langgraph.graph.state import CompiledStateGraph
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -31,6 +32,12 @@ def get_token_from_header(request: Request):
     return token
 
 
+@lru_cache(maxsize=16)
+def _render_prompt(prompt: str, company: str) -> str:
+    """Fill a company-scoped instructions template; cached per company."""
+    return prompt.format(company=company)
+
+
 async def _handle_minion_stream(
     request: Request,
     chat_request: MinionRequest,
@@ -54,7 +61,7 @@ async def _handle_minion_stream(
         company = frappe_client.get_default_company()
         current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S %Z")
         context_info = f"**Current Date and Time**: {current_datetime}\n\n"
-        system_prompt = context_info + prompt.format(company=company)
+        system_prompt = context_info + _render_prompt(prompt, company)
         messages.append(SystemMessage(content=system_prompt))
 
     messages.append(HumanMessage(content=chat_request.query))
@@ -4,6 +4,7 @@ Uses the new SubAgentMiddleware-based graph instead of the
 traditional LangGraph orchestrator-worker pattern.
 """
 
+import asyncio
 from datetime import datetime
 import json
 
@@ -69,8 +70,7 @@ async def stream_subagent(
 
         # Get user context
         frappe_client = FrappeClient(access_token=access_token)
-        company = frappe_client.get_default_company()
-        user_info = frappe_client.get_current_user_info()
+        company, user_info = await frappe_client.gather_user_context()
         current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S %Z")
 
         logger.debug(
@@ -91,36 +91,41 @@ async def stream_subagent(
                         first_name=user_info.get("first_name", ""),
                         last_name=user_info.get("last_name", ""),
                     )
-                    await zep_client.get_or_create_thread(
-                        thread_id=thread,
-                        user_id=user_id,
-                    )
             except Exception as e:
                 logger.warning(f"Failed to setup Zep user/thread: {e}")
                 user_id = None
 
-        # Fetch user context from Zep knowledge graph (for dynamic system prompt)
+        # Ensure the Zep thread exists and fetch user context from the Zep
+        # knowledge graph (for dynamic system prompt). Both only need the
+        # user, so run them concurrently.
         user_context = ""
-        if zep_client.is_available() and user_id and request_data.query:
-            try:
-                user_context_results = await zep_client.search_graph(
-                    query=request_data.query,
-                    user_id=user_id,
-                    limit=5,  # Keep it small for speed
+        if user_id:
+            setup = [zep_client.get_or_create_thread(thread_id=thread, user_id=user_id)]
+            if request_data.query:
+                setup.append(
+                    zep_client.search_graph(
+                        query=request_data.query,
+                        user_id=user_id,
+                        limit=5,  # Keep it small for speed
+                    )
                 )
+            # Neither call raises: failures come back as None and [] instead
+            thread_result, *search_result = await asyncio.gather(*setup)
+
+            if thread_result is None:
+                logger.warning(f"Failed to setup Zep thread {thread}")
+                user_id = None
+
+            user_context_results = search_result[0] if search_result else []
+            if user_context_results:
                 logger.debug(f"User context results: {user_context_results}")
-                if user_context_results:
-                    context_parts = ["## User Context (Personal Knowledge)"]
-                    for item in user_context_results:
-                        fact = item.get("fact", "")
-                        if fact:
-                            context_parts.append(f"- {fact}")
-                    user_context = "\n".join(context_parts)
-                    logger.debug(
-                        f"Fetched user context: {len(user_context_results)} facts"
-                    )
-            except Exception as e:
-                logger.warning(f"Failed to fetch user context from Zep: {e}")
+                context_parts = ["## User Context (Personal Knowledge)"]
+                for item in user_context_results:
+                    fact = item.get("fact", "")
+                    if fact:
+                        context_parts.append(f"- {fact}")
+                user_context = "\n".join(context_parts)
+                logger.debug(f"Fetched user context: {len(user_context_results)} facts")
 
         # Get pre-built subagent graph from app state
         graph: CompiledStateGraph = request.app.state.subagent_graph
@@ -196,17 +201,6 @@ async def stream_subagent(
             logger.debug(f"Processing query for thread: {thread}")
             messages.append(HumanMessage(content=request_data.query))
 
-            # Sync to Zep
-            if zep_client.is_available() and user_id:
-                try:
-                    await zep_client.add_message(
-                        thread_id=thread,
-                        role="user",
-                        content=request_data.query,
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to sync message to Zep: {e}")
-
         inputs = {
             "messages": messages,
             "access_token": access_token,
@@ -220,6 +214,8 @@ async def stream_subagent(
             provider=settings.provider,
             zep_client=zep_client if zep_client.is_available() else None,
             zep_thread_id=thread,
+            # Synced in the background once the stream starts
+            zep_user_message=request_data.query if user_id else None,
         )
 
     except HTTPException:
@@ -0,0 +1,60 @@
+import time
+
+from loguru import logger
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the upstream service is failing."""
+
+
+class CircuitBreaker:
+    """
+    Fails calls to an upstream service fast while it is unhealthy.
+
+    After fail_threshold consecutive failures the circuit opens and check()
+    rejects calls for reset_after seconds. Once that window has passed, calls
+    are let through again; the next failure reopens the circuit immediately
+    and a success closes it.
+    """
+
+    def __init__(self, name: str, fail_threshold: int = 5, reset_after: float = 30.0):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return (
+            self._opened_at is not None
+            and time.monotonic() - self._opened_at < self.reset_after
+        )
+
+    def check(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if self.is_open:
+            raise CircuitOpenError(
+                f"{self.name} is unavailable; failing fast after "
+                f"{self._failures} consecutive failures"
+            )
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("{} circuit closed", self.name)
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.fail_threshold:
+            if self._opened_at is None:
+                logger.warning(
+                    "{} circuit opened after {} consecutive failures",
+                    self.name,
+                    self._failures,
+                )
+            self._opened_at = time.monotonic()
@@ -1,3 +1,6 @@
+import asyncio
+from urllib.parse import quote
+
 import requests
 from loguru import logger
 from ..utils.config import settings
@@ -177,7 +180,7 @@ class FrappeClient:
 
             # Method 2: Fetch full user document with specific fields
             user_doc_response = requests.get(
-                f"{self.frappe_url}/api/resource/User/{username}",
+                f"{self.frappe_url}/api/resource/User/{quote(username, safe='')}",
                 headers=self.headers,
                 params={
                     "fields": '["full_name", "email", "roles", "department"]'
@@ -209,3 +212,19 @@ class FrappeClient:
         except Exception as e:
             logger.error(f"Failed to fetch user info: {e}", exc_info=True)
             return {}
+
+    async def gather_user_context(self) -> tuple[str | None, dict]:
+        """
+        Fetch the default company and current user info concurrently.
+
+        Both lookups are blocking HTTP calls, so they run in worker threads and
+        overlap instead of running back to back on the event loop.
+
+        Returns:
+            tuple: (default company, user info as returned by get_current_user_info)
+        """
+        company, user_info = await asyncio.gather(
+            asyncio.to_thread(self.get_default_company),
+            asyncio.to_thread(self.get_current_user_info),
+        )
+        return company, user_info
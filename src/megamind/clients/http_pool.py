@@ -0,0 +1,161 @@
+import asyncio
+import random
+import weakref
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+from megamind.utils.config import settings
+
+
+# One pair of clients per event loop, with and without RetryTransport, over a
+# single connection pool: httpx connections are bound to the loop that opened
+# them, so a client must never be reused from another loop.
+_loop_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Fail fast on unreachable hosts and pool exhaustion while still allowing slow
+# responses. Clients override the read budget for known slow endpoints.
+_DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0, pool=5.0)
+
+
+# Request extension that marks a non-GET request as safe to replay, e.g. a
+# read-only search POST: client.request(..., extensions={IDEMPOTENT: True})
+IDEMPOTENT = "megamind.idempotent"
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header, if it has one."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    Retries idempotent requests on transient failures with jittered backoff.
+
+    Dropped connections and 429/502/503/504 responses are retried up to
+    max_retries times, sleeping a random 0..backoff * 2**attempt seconds
+    (at most max_backoff) in between, or as long as the response's
+    Retry-After asks for. Requests that are not idempotent are never
+    replayed.
+
+    Connect errors are left to the wrapped transport's own connect retries,
+    so an unreachable host is not retried at both layers. Timeouts are not
+    retried either: the upstream is slow or unreachable, and replaying the
+    request would only multiply the wait.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 5.0,
+    ):
+        self._transport = transport
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        retryable = request.method in _IDEMPOTENT_METHODS or request.extensions.get(
+            IDEMPOTENT, False
+        )
+        attempt = 0
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (httpx.ConnectError, httpx.TimeoutException):
+                raise
+            except httpx.TransportError:
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = None
+            else:
+                if (
+                    not retryable
+                    or attempt >= self.max_retries
+                    or response.status_code not in _RETRY_STATUSES
+                ):
+                    return response
+                delay = _retry_after(response)
+                if delay is not None and delay > self.max_backoff:
+                    # Not worth holding the caller for; let it see the response
+                    return response
+                await response.aclose()
+            attempt += 1
+            if delay is None:
+                delay = random.uniform(
+                    0, min(self.max_backoff, self.backoff * 2**attempt)
+                )
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def get_shared_async_client(retries: bool = True) -> httpx.AsyncClient:
+    """
+    Get the HTTP client shared by all HTTP-based service clients on this loop.
+
+    Sharing one pool keeps connections warm across clients, however often the
+    clients themselves are re-created, and bounds the number of open sockets
+    for the whole process. httpx advertises every content encoding it can
+    decode in Accept-Encoding, so with the brotli and zstd extras installed
+    responses may come back as br or zstd.
+
+    Must be called from a running event loop.
+
+    Args:
+        retries: Whether idempotent requests are retried by RetryTransport.
+            Clients that retry on their own pass False so a request is not
+            retried at both layers; both clients share the same connections.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _loop_clients.get(loop)
+    if clients is None or any(client.is_closed for client in clients):
+        http_transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+                keepalive_expiry=120.0,
+            ),
+            http2=settings.http2_enabled,
+            # Retries failed connection attempts only; a request that reached
+            # the server is never replayed.
+            retries=settings.http_connect_retries,
+        )
+        retry_transport = RetryTransport(
+            http_transport, max_retries=settings.http_request_retries
+        )
+        clients = (
+            httpx.AsyncClient(timeout=_DEFAULT_TIMEOUT, transport=retry_transport),
+            httpx.AsyncClient(timeout=_DEFAULT_TIMEOUT, transport=http_transport),
+        )
+        _loop_clients[loop] = clients
+    return clients[0] if retries else clients[1]
+
+
+async def close_shared_async_client():
+    """Close this loop's shared HTTP clients. Called once on application shutdown."""
+    clients = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if clients is not None:
+        for client in clients:
+            await client.aclose()
@@ -1,42 +1,75 @@
+import asyncio
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
 from loguru import logger
+from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.interceptors import MCPToolCallRequest, MCPToolCallResult
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
 from megamind.utils.config import settings
 
+logger = logger.bind(component="mcp")
+
+# Seconds to wait before reopening a server session that died unexpectedly
+_SESSION_REOPEN_DELAY = 5.0
+
+
+@lru_cache(maxsize=1)
+def _build_servers_config() -> dict:
+    """Build the MCP server configuration once per process.
+
+    Avoids re-reading settings and re-checking the server path on the file
+    system when the client is re-initialized after a cleanup.
+    """
+    servers_config = {}
+    # Add erpnext server if path is configured
+    if settings.frappe_mcp_server_path != "none" and os.path.exists(
+        settings.frappe_mcp_server_path
+    ):
+        servers_config["erpnext"] = {
+            "command": "node",
+            "args": [settings.frappe_mcp_server_path],
+            "transport": "stdio",
+            "env": {
+                "FRAPPE_URL": settings.frappe_url,
+                "FRAPPE_API_KEY": settings.frappe_api_key,
+                "FRAPPE_API_SECRET": settings.frappe_api_secret,
+                "AUTH_MODE": settings.frappe_auth_mode,
+                # Add unique identifiers to prevent connection conflicts
+                "SERVER_ID": "erpnext",
+                "PROCESS_ID": str(os.getpid()),
+            },
+        }
+    return servers_config
+
 
 # TODO: Frappe client initialization should receive a cookie or token for authentication
 class McpClientManager:
     def __init__(self):
         self._client: Optional[MultiServerMCPClient] = None
+        self._close_client: Optional[Callable[[], Awaitable[None]]] = None
+        self._server_names: tuple[str, ...] = ()
+        self._sessions: dict[str, ClientSession] = {}
+        self._session_tasks: dict[str, asyncio.Task] = {}
+        self._session_stop: Optional[asyncio.Event] = None
+        self._tools: Optional[list[BaseTool]] = None
         self._is_initialized: bool = False
 
-    def initialize_client(self):
-        """Initializes the MCP client if not already initialized."""
+    async def initialize_client(self):
+        """Initializes the MCP client if not already initialized.
+
+        One session per server is opened concurrently and kept alive for the
+        lifetime of the process, so startup takes as long as the slowest server
+        and tool calls reuse the running subprocess instead of respawning it.
+        """
         if self._is_initialized:
             logger.debug("MCP client already initialized, skipping...")
             return
 
         if self._client is None:
-            servers_config = {}
-            # Add erpnext server if path is configured
-            if settings.frappe_mcp_server_path != "none" and os.path.exists(
-                settings.frappe_mcp_server_path
-            ):
-                servers_config["erpnext"] = {
-                    "command": "node",
-                    "args": [settings.frappe_mcp_server_path],
-                    "transport": "stdio",
-                    "env": {
-                        "FRAPPE_URL": settings.frappe_url,
-                        "FRAPPE_API_KEY": settings.frappe_api_key,
-                        "FRAPPE_API_SECRET": settings.frappe_api_secret,
-                        "AUTH_MODE": settings.frappe_auth_mode,
-                        # Add unique identifiers to prevent connection conflicts
-                        "SERVER_ID": "erpnext",
-                        "PROCESS_ID": str(os.getpid()),
-                    },
-                }
+            servers_config = _build_servers_config()
 
             if not servers_config:
                 raise RuntimeError(
@@ -47,8 +80,134 @@ class McpClientManager:
                 f"Initializing MCP client with servers: {list(servers_config.keys())}"
             )
             self._client = MultiServerMCPClient(servers_config)
+            self._close_client = self._resolve_close_method(self._client)
+            self._server_names = tuple(servers_config.keys())
+            await self._open_sessions()
             self._is_initialized = True
 
+    async def _open_sessions(self):
+        """Open a persistent session to every server in parallel.
+
+        Waits at most settings.mcp_session_open_timeout seconds, so one slow
+        server cannot hold up startup. Sessions still opening then finish in
+        the background; until they do, tool calls use per-call sessions.
+        """
+        self._session_stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        ready: dict[str, asyncio.Future] = {}
+        for server_name in self._server_names:
+            ready[server_name] = loop.create_future()
+            self._session_tasks[server_name] = asyncio.create_task(
+                self._hold_session(server_name, ready[server_name])
+            )
+
+        _, pending = await asyncio.wait(
+            ready.values(), timeout=settings.mcp_session_open_timeout
+        )
+        for server_name, future in ready.items():
+            if future in pending:
+                logger.warning(
+                    f"MCP session {server_name} is still opening; "
+                    "using per-call sessions until it is ready"
+                )
+            elif future.result() is not None:
+                logger.debug("Opened persistent MCP session: {}", server_name)
+
+    async def _hold_session(self, server_name: str, ready: asyncio.Future):
+        """Keep a server session open until cleanup is requested.
+
+        The session context is entered and exited inside this task, which is
+        what the stdio transport's cancel scopes require. ready resolves to
+        the session, or to None if it could not be opened. A session that
+        dies unexpectedly is reopened; meanwhile tool calls fall back to
+        per-call sessions.
+        """
+        while True:
+            try:
+                async with self._client.session(server_name) as session:
+                    self._sessions[server_name] = session
+                    if not ready.done():
+                        ready.set_result(session)
+                    else:
+                        logger.info(f"Reopened MCP session {server_name}")
+                    await self._session_stop.wait()
+                    return
+            except Exception as e:
+                if not ready.done():
+                    logger.warning(f"Failed to open MCP session {server_name}: {e}")
+                    ready.set_result(None)
+                    return
+                logger.warning(f"MCP session {server_name} closed with error: {e}")
+            finally:
+                self._sessions.pop(server_name, None)
+
+            try:
+                await asyncio.wait_for(
+                    self._session_stop.wait(), timeout=_SESSION_REOPEN_DELAY
+                )
+                return
+            except asyncio.TimeoutError:
+                pass
+
+    def get_session(self, server_name: str) -> ClientSession:
+        """Returns the persistent session for a server."""
+        session = self._sessions.get(server_name)
+        if session is None:
+            raise RuntimeError(f"No open MCP session for server: {server_name}")
+        return session
+
+    async def get_tools(self) -> list[BaseTool]:
+        """Returns the MCP tools of all servers.
+
+        Tools are loaded once and cached. They are not bound to a session:
+        each call looks up the server's persistent session at call time, so
+        tools held by compiled graphs keep working when a session is
+        reopened, and fall back to a per-call session while it is down.
+        """
+        if self._tools is not None:
+            return self._tools
+
+        client = self.get_client()
+        tools: list[BaseTool] = []
+        for server_name in self._server_names:
+            tools.extend(
+                await load_mcp_tools(
+                    None,
+                    connection=client.connections[server_name],
+                    server_name=server_name,
+                    tool_interceptors=[self._call_on_live_session],
+                )
+            )
+
+        self._tools = tools
+        return tools
+
+    async def _call_on_live_session(
+        self,
+        request: MCPToolCallRequest,
+        handler: Callable[[MCPToolCallRequest], Awaitable[MCPToolCallResult]],
+    ) -> MCPToolCallResult:
+        """Run a tool call on its server's persistent session, if one is open.
+
+        Otherwise, or when the call needs its own headers, handler runs it on
+        a per-call session.
+        """
+        session = self._sessions.get(request.server_name)
+        if session is None or request.headers is not None:
+            return await handler(request)
+        return await session.call_tool(request.name, request.args)
+
+    @staticmethod
+    def _resolve_close_method(
+        client: MultiServerMCPClient,
+    ) -> Optional[Callable[[], Awaitable[None]]]:
+        """Resolve the client's close coroutine once so cleanup needs no reflection."""
+        for method_name in ("aclose", "close", "cleanup", "disconnect"):
+            method = getattr(client, method_name, None)
+            if method is not None:
+                return method
+        return None
+
     async def cleanup(self):
         """Cleanup the MCP client connections."""
         if self._client is None:
@@ -56,39 +215,49 @@ class McpClientManager:
 
         try:
             logger.info("Cleaning up MCP client connections...")
+            await self._close_sessions()
             await self._cleanup_main_client()
-            await self._cleanup_server_connections()
             logger.info("MCP client cleanup completed")
         except Exception as e:
             logger.error(f"Error during MCP client cleanup: {e}")
         finally:
             self._client = None
+            self._close_client = None
+            self._server_names = ()
+            self._tools = None
             self._is_initialized = False
 
+    async def _close_sessions(self):
+        """Close the persistent server sessions concurrently."""
+        if self._session_stop is not None:
+            self._session_stop.set()
+
+        await asyncio.gather(
+            *(self._close_session(server_name) for server_name in self._server_names)
+        )
+        self._session_stop = None
+
+    async def _close_session(self, server_name: str):
+        """Wait for a session task to exit, logging instead of raising."""
+        task = self._session_tasks.pop(server_name, None)
+        if task is None:
+            return
+
+        try:
+            await task
+            logger.debug("Closed persistent MCP session: {}", server_name)
+        except Exception as e:
+            logger.warning(f"Error closing MCP session {server_name}: {e}")
+
     async def _cleanup_main_client(self):
         """Cleanup the main client connection."""
-        cleanup_methods = ["close", "cleanup", "disconnect"]
-        for method_name in cleanup_methods:
-            if hasattr(self._client, method_name):
-                method = getattr(self._client, method_name)
-                await method()
-                logger.debug(f"Called {method_name} on main client")
-                break
-
-    async def _cleanup_server_connections(self):
-        """Cleanup individual server connections."""
-        if not hasattr(self._client, "_servers"):
+        if self._close_client is None:
             return
 
-        for server_name, server in self._client._servers.items():
-            if hasattr(server, "close"):
-                try:
-                    await server.close()
-                    logger.debug(f"Closed connection to server: {server_name}")
-                except Exception as e:
-                    logger.warning(
-                        f"Error closing connection to server {server_name}: {e}"
-                    )
+        await self._close_client()
+        logger.opt(lazy=True).debug(
+            "Called {} on main client", lambda: self._close_client.__name__
+        )
 
     def get_client(self) -> MultiServerMCPClient:
         """Returns the MCP client instance."""
@@ -1,6 +1,32 @@
+import asyncio
+from functools import lru_cache
+from typing import Optional
+
 import httpx
+import orjson
 from loguru import logger
 
+from megamind.clients.circuit_breaker import CircuitBreaker
+from megamind.clients.http_pool import IDEMPOTENT, get_shared_async_client
+from megamind.utils.cache import SemanticCache, SingleFlight, freeze
+from megamind.utils.config import settings
+
+logger = logger.bind(component="minion")
+
+_BASE_HEADERS = {"Content-Type": "application/json"}
+
+# Read-only POST endpoints whose concurrent identical requests can share one
+# response, and which the shared transport may retry. Writes must never be
+# added here.
+_DEDUPABLE_PATHS = frozenset({"/api/v1/graphrag/search"})
+_IDEMPOTENT = {IDEMPOTENT: True}
+
+# Per-endpoint timeouts overriding the shared client's default. Graph search
+# runs retrieval plus LLM work upstream, so it gets a longer read budget.
+_TIMEOUTS = {
+    "/api/v1/graphrag/search": httpx.Timeout(60.0, connect=5.0, pool=5.0),
+}
+
 
 class MinionClient:
     """
@@ -8,22 +34,172 @@ class MinionClient:
     Simplified to only provide document search functionality.
     """
 
-    def __init__(self, minion_api_url: str):
+    def __init__(
+        self, minion_api_url: str, semantic_cache: Optional[SemanticCache] = None
+    ):
         """
         Initializes the Minion client.
+
+        Args:
+            minion_api_url: The base URL for the Minion API
+            semantic_cache: Optional cache that serves near-duplicate searches
+                without calling Minion
         """
         self.api_url = minion_api_url
-        logger.debug(f"Initializing Minion client with API URL: {self.api_url}")
+        self._semantic_cache = semantic_cache
+        self._inflight = SingleFlight()
+        self._breaker = CircuitBreaker("Minion")
+        self._search_url = httpx.URL(f"{self.api_url}/api/v1/graphrag/search")
+        logger.debug("Initializing Minion client with API URL: {}", self.api_url)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Returns the pooled HTTP client for the running event loop.
+
+        Resolved per call rather than stored, so the singleton client stays
+        usable when driven from more than one event loop.
+        """
+        return get_shared_async_client()
+
+    async def startup(self):
+        """
+        Opens a keep-alive connection to the Minion service ahead of traffic.
+
+        Logs the negotiated protocol: with HTTP/2 concurrent searches (see
+        search_documents_batch) are multiplexed over this one connection.
+        """
+        client = await self._get_client()
+        try:
+            response = await client.get(f"{self.api_url}/health", timeout=5.0)
+            logger.debug(
+                "Minion connection pool warmed up over {}", response.http_version
+            )
+            if settings.http2_enabled and response.http_version != "HTTP/2":
+                logger.info(
+                    "Minion negotiated {}; concurrent searches will use separate "
+                    "connections",
+                    response.http_version,
+                )
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to warm up Minion connection pool: {e}")
+
+    async def aclose(self):
+        """
+        Cancels in-flight coalesced requests ahead of shutdown.
+
+        The HTTP pool itself is shared and is closed separately, so the app
+        lifespan calls this before close_shared_async_client():
+
+            await get_minion_client().aclose()
+            await close_shared_async_client()
+        """
+        self._inflight.cancel_all()
 
     async def search_document(self, query: str):
         """
         Searches for documents in the Minion service using graph-based search.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.api_url}/api/v1/graphrag/search",
-                json={"query": query},
-                timeout=30.0,
+        return await self._do_search(query)
+
+    async def search_documents_batch(self, queries: list[str]) -> list:
+        """
+        Runs several document searches concurrently over the pooled connection.
+
+        Results are returned in the same order as the queries.
+        """
+        return await asyncio.gather(*(self._do_search(query) for query in queries))
+
+    async def _do_search(self, query: str):
+        """
+        Posts a single graph-based search request.
+
+        With a semantic cache configured, a result cached for a similar query
+        is returned instead.
+        """
+        if self._semantic_cache is None:
+            return await self._request(
+                "POST", self._search_url, payload={"query": query}
+            )
+
+        vector, cached = await self._semantic_cache.lookup(query)
+        if cached is not None:
+            logger.debug("Semantic cache hit for a {}-character query", len(query))
+            return cached
+
+        result = await self._request("POST", self._search_url, payload={"query": query})
+        self._semantic_cache.put(vector, result)
+        return result
+
+    async def _request(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        payload: Optional[dict] = None,
+        params: Optional[dict] = None,
+    ):
+        """
+        Sends a request and decodes the JSON response.
+
+        Concurrent identical read-only requests are coalesced into a single HTTP call.
+        """
+        url = httpx.URL(url)
+        if method != "GET" and url.path not in _DEDUPABLE_PATHS:
+            return await self._send(method, url, payload, params)
+
+        key = (method, url, freeze(payload), freeze(params))
+        return await self._inflight.do(
+            key, lambda: self._send(method, url, payload, params)
+        )
+
+    async def _send(
+        self,
+        method: str,
+        url: httpx.URL,
+        payload: Optional[dict],
+        params: Optional[dict],
+    ):
+        """
+        Sends a request over the pooled client and decodes the JSON response.
+
+        Raises:
+            CircuitOpenError: If Minion has been failing and the request is
+                rejected without being sent
+        """
+        self._breaker.check()
+        client = await self._get_client()
+        try:
+            response = await client.request(
+                method,
+                url,
+                content=orjson.dumps(payload) if payload is not None else None,
+                params=params,
+                headers=_BASE_HEADERS,
+                timeout=_TIMEOUTS.get(url.path, httpx.USE_CLIENT_DEFAULT),
+                extensions=_IDEMPOTENT if url.path in _DEDUPABLE_PATHS else {},
             )
+        except httpx.TransportError:
+            self._breaker.record_failure()
+            raise
+        if response.is_server_error:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        if not response.is_success:
             response.raise_for_status()
-            return response.json()
+        return orjson.loads(response.content)
+
+
+@lru_cache(maxsize=1)
+def get_minion_client() -> MinionClient:
+    """Get the singleton Minion client instance."""
+    semantic_cache = None
+    if settings.minion_semantic_cache_enabled:
+        from megamind.configuration import Configuration
+
+        embeddings = Configuration().get_embeddings()
+        semantic_cache = SemanticCache(
+            embeddings.aembed_query,
+            threshold=settings.minion_semantic_cache_threshold,
+            ttl=settings.minion_semantic_cache_ttl,
+        )
+    return MinionClient(settings.minion_api_url, semantic_cache=semantic_cache)
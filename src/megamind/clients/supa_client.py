@@ -1,6 +1,10 @@
+from functools import lru_cache
+
 from supabase import create_client, Client
 from ..utils.config import settings
 
 
+@lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
+    """Get the singleton Supabase client, sharing one connection pool."""
     return create_client(settings.supabase_url, settings.supabase_key)
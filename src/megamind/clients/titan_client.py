@@ -1,11 +1,38 @@
+from functools import lru_cache
+
 import httpx
+import orjson
 from loguru import logger
 from typing import List, Dict, Optional
 
+from megamind.clients.http_pool import IDEMPOTENT, get_shared_async_client
 from megamind.configuration import Configuration
-from megamind.models.requests import DocumentRequestBody
+from megamind.models.requests import DocumentRequestBody, TitanProcessRequest
+from megamind.utils.cache import SingleFlight, TTLCache, freeze
 from megamind.utils.config import settings
 
+logger = logger.bind(component="titan")
+
+# Knowledge entries change rarely relative to how often agents re-read them
+# within a conversation.
+_knowledge_cache = TTLCache(
+    maxsize=settings.titan_cache_maxsize, ttl=settings.titan_cache_ttl
+)
+
+# Endpoint paths, joined to the configured base URL per request.
+_PROCESS_REQUESTS_PATH = "/api/v1/process-requests"
+_PROCESS_DEFINITIONS_PATH = "/api/v1/process-definitions"
+_KNOWLEDGE_PATH = "/api/v1/erpnext-knowledge"
+_KNOWLEDGE_SEARCH_PATH = "/api/v1/erpnext-knowledge/search"
+
+# Knowledge search is a POST only because its filters travel in the body; it
+# reads, so concurrent identical searches share one call and may be retried.
+# The other POSTs create knowledge, processes and requests.
+_DEDUPABLE_PATHS = frozenset({_KNOWLEDGE_SEARCH_PATH})
+_IDEMPOTENT = {IDEMPOTENT: True}
+
+_inflight = SingleFlight()
+
 
 class TitanClient:
     """
@@ -20,8 +47,13 @@ class TitanClient:
             titan_api_url: The base URL for the Titan API
         """
         self.api_url = settings.titan_api_url
+        self._base_url = self.api_url.rstrip("/")
         self.tenant_id = settings.tenant_id
-        logger.debug(f"Initializing Titan client with API URL: {self.api_url}")
+        self._headers = {
+            "x-tenant-id": self.tenant_id,
+            "Content-Type": "application/json",
+        }
+        logger.debug("Initializing Titan client with API URL: {}", self.api_url)
 
     async def submit_documents(
         self, file_names: list[DocumentRequestBody], callback_url: str
@@ -39,25 +71,18 @@ class TitanClient:
         Raises:
             httpx.HTTPError: If the request to Titan fails
         """
-        logger.info(f"Submitting {len(file_names)} files to Titan service")
-        logger.debug(f"Callback URL: {callback_url}")
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.api_url}/api/v1/process-requests",
-                headers={"x-tenant-id": self.tenant_id},
-                json={
-                    "file_names": [file.model_dump() for file in file_names],
-                    "callback_url": callback_url,
-                },
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-            job_id = data.get("id")
-
-            logger.info(f"Titan processing job created: {job_id}")
-            return job_id
+        logger.info("Submitting {} files to Titan service", len(file_names))
+        logger.debug("Callback URL: {}", callback_url)
+
+        # Serialized in pydantic-core, without an intermediate dict per file
+        body = TitanProcessRequest(
+            file_names=file_names, callback_url=callback_url
+        ).model_dump_json()
+        data = await self._request("POST", _PROCESS_REQUESTS_PATH, payload=body)
+        job_id = data.get("id")
+
+        logger.info("Titan processing job created: {}", job_id)
+        return job_id
 
     async def search_knowledge(
         self,
@@ -81,7 +106,9 @@ class TitanClient:
         Raises:
             httpx.HTTPError: If the request to Titan fails
         """
-        logger.info(f"Searching Titan knowledge: '{query[:100]}...'")
+        logger.opt(lazy=True).info(
+            "Searching Titan knowledge: '{}...'", lambda: query[:100]
+        )
 
         # Build request payload
         payload = {
@@ -93,18 +120,10 @@ class TitanClient:
         if doctype_filter:
             payload["doctype_filter"] = doctype_filter
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.api_url}/api/v1/erpnext-knowledge/search",
-                headers={"x-tenant-id": self.tenant_id},
-                json=payload,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            results = response.json()
+        results = await self._request("POST", _KNOWLEDGE_SEARCH_PATH, payload=payload)
 
-            logger.info(f"Found {len(results)} knowledge entries")
-            return results
+        logger.info("Found {} knowledge entries", len(results))
+        return results
 
     async def get_knowledge_by_id(self, knowledge_id: int) -> Dict:
         """
@@ -119,16 +138,12 @@ class TitanClient:
         Raises:
             httpx.HTTPError: If the request fails or knowledge not found
         """
-        logger.debug(f"Fetching knowledge entry: {knowledge_id}")
+        logger.debug("Fetching knowledge entry: {}", knowledge_id)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_url}/api/v1/erpnext-knowledge/{knowledge_id}",
-                headers={"x-tenant-id": self.tenant_id},
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._cached_get(
+            ("knowledge_entry", self.tenant_id, knowledge_id),
+            f"{_KNOWLEDGE_PATH}/{knowledge_id}",
+        )
 
     async def list_knowledge(
         self,
@@ -153,7 +168,7 @@ class TitanClient:
             httpx.HTTPError: If the request fails
         """
         logger.debug(
-            f"Listing knowledge entries (doctype={doctype}, module={module})"
+            "Listing knowledge entries (doctype={}, module={})", doctype, module
         )
 
         params = {"skip": skip, "limit": limit}
@@ -162,18 +177,14 @@ class TitanClient:
         elif module:
             params["module"] = module
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_url}/api/v1/erpnext-knowledge",
-                headers={"x-tenant-id": self.tenant_id},
-                params=params,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            results = response.json()
+        results = await self._cached_get(
+            ("knowledge_list", self.tenant_id, freeze(params)),
+            _KNOWLEDGE_PATH,
+            params=params,
+        )
 
-            logger.info(f"Retrieved {len(results)} knowledge entries")
-            return results
+        logger.info("Retrieved {} knowledge entries", len(results))
+        return results
 
     async def create_knowledge_entry(
         self,
@@ -207,7 +218,7 @@ class TitanClient:
         Raises:
             httpx.HTTPError: If the request fails
         """
-        logger.info(f"Creating knowledge entry: {title}")
+        logger.info("Creating knowledge entry: {}", title)
 
         payload = {
             "title": title,
@@ -226,18 +237,13 @@ class TitanClient:
         if meta_data:
             payload["meta_data"] = meta_data
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.api_url}/api/v1/erpnext-knowledge",
-                headers={"x-tenant-id": self.tenant_id},
-                json=payload,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            result = response.json()
+        result = await self._request("POST", _KNOWLEDGE_PATH, payload=payload)
 
-            logger.info(f"Knowledge entry created with ID: {result.get('id')}")
-            return result
+        logger.info("Knowledge entry created with ID: {}", result.get("id"))
+
+        # A new entry changes every listing; single-entry lookups stay valid.
+        _knowledge_cache.invalidate("knowledge_list")
+        return result
 
     async def create_process_definition(
         self,
@@ -269,7 +275,7 @@ class TitanClient:
         Raises:
             httpx.HTTPError: If the request fails
         """
-        logger.info(f"Creating process definition: {process_id}")
+        logger.info("Creating process definition: {}", process_id)
 
         payload = {
             "process_id": process_id,
@@ -285,15 +291,92 @@ class TitanClient:
         if prerequisites:
             payload["prerequisites"] = prerequisites
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.api_url}/api/v1/process-definitions",
-                headers={"x-tenant-id": self.tenant_id},
-                json=payload,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            result = response.json()
-
-            logger.info(f"Process definition created with ID: {result.get('id')}")
-            return result
+        result = await self._request("POST", _PROCESS_DEFINITIONS_PATH, payload=payload)
+
+        logger.info("Process definition created with ID: {}", result.get("id"))
+        return result
+
+    async def _cached_get(
+        self, cache_key: tuple, path: str, params: Optional[Dict] = None
+    ):
+        """
+        GETs a path through the knowledge cache.
+
+        Fresh entries are served without a request. If Titan is unreachable or
+        answers with a server error, an expired entry is served instead of
+        failing; client errors such as 404 are always raised.
+        """
+        cached = _knowledge_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Titan {} served from cache", path)
+            return cached
+
+        try:
+            result = await self._request("GET", path, params=params)
+        except httpx.HTTPError as e:
+            if isinstance(e, httpx.HTTPStatusError) and not e.response.is_server_error:
+                raise
+            stale = _knowledge_cache.get_stale(cache_key)
+            if stale is None:
+                raise
+            logger.warning("Titan unavailable, serving stale {}: {}", path, e)
+            return stale
+
+        _knowledge_cache.set(cache_key, result)
+        return result
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict | str] = None,
+        params: Optional[Dict] = None,
+    ):
+        """
+        Sends a request to Titan and decodes the JSON response.
+
+        The payload is either a dict to serialize or an already encoded JSON
+        body.
+
+        Concurrent identical read-only requests for the same tenant are
+        coalesced into a single HTTP call.
+        """
+        if method != "GET" and path not in _DEDUPABLE_PATHS:
+            return await self._send(method, path, payload, params)
+
+        key = (method, path, self.tenant_id, freeze(payload), freeze(params))
+        return await _inflight.do(
+            key, lambda: self._send(method, path, payload, params)
+        )
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict | str],
+        params: Optional[Dict],
+    ):
+        """
+        Sends a request over the pooled client and decodes the JSON response.
+        """
+        client = get_shared_async_client()
+        response = await client.request(
+            method,
+            self._base_url + path,
+            headers=self._headers,
+            content=(
+                payload
+                if payload is None or isinstance(payload, str)
+                else orjson.dumps(payload)
+            ),
+            params=params,
+            extensions=_IDEMPOTENT if path in _DEDUPABLE_PATHS else {},
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+
+@lru_cache(maxsize=1)
+def get_titan_client() -> TitanClient:
+    """Get the singleton Titan client instance."""
+    return TitanClient()
@@ -3,13 +3,55 @@ Zep Cloud client for Knowledge Graph-based memory and thread management.
 Uses the new Zep v3 API for threads, messages, and graph operations.
 """
 
-from typing import Optional, List
+import asyncio
+import random
+import threading
+import weakref
+from typing import Awaitable, Callable, List, Optional, TypeVar
+import httpx
 from loguru import logger
 from zep_cloud.client import AsyncZep
 from zep_cloud import Message
+from zep_cloud.core.api_error import ApiError
 
+from megamind.clients.circuit_breaker import CircuitBreaker
+from megamind.clients.http_pool import get_shared_async_client
+from megamind.utils.cache import SingleFlight, TTLCache
 from megamind.utils.config import settings
 
+T = TypeVar("T")
+
+_TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 5.0
+
+
+def _is_transient(exc: Exception, replay_safe: bool) -> bool:
+    """Whether a failed Zep call is worth retrying."""
+    if isinstance(exc, ApiError):
+        if exc.status_code == 429:
+            return True
+        return replay_safe and exc.status_code in _TRANSIENT_STATUSES
+    return replay_safe and isinstance(exc, httpx.TransportError)
+
+
+def _is_server_failure(exc: Exception) -> bool:
+    """Whether a failed Zep call points at Zep itself being unhealthy."""
+    if isinstance(exc, ApiError):
+        return exc.status_code is not None and exc.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _unwrap(obj) -> dict:
+    """Convert a Zep SDK response model into a plain dict."""
+    # zep-cloud v3 responses are always pydantic v2 models
+    return obj.model_dump(warnings=False)
+
+
+def _unwrap_all(items) -> List[dict]:
+    """Convert a list of Zep SDK response models into plain dicts."""
+    return [item.model_dump(warnings=False) for item in items or []]
+
 
 class ZepClient:
     """
@@ -31,21 +73,112 @@ class ZepClient:
             api_key: Optional API key override (defaults to settings.zep_api_key)
         """
         self.api_key = api_key or settings.zep_api_key
+        # Users and thread ids confirmed to exist in Zep, so the get-or-create
+        # methods can skip the round-trip on every later turn.
+        self._known_users = TTLCache(maxsize=4096, ttl=3600.0)
+        self._known_threads = TTLCache(maxsize=4096, ttl=3600.0)
+        # Concurrent identical reads, and concurrent first requests for the
+        # same user or thread, share one call instead of racing
+        self._inflight = SingleFlight()
 
         if not self.api_key:
             logger.warning("Zep API key not configured. Zep features will be disabled.")
-            self.client = None
-        else:
+        self._available = bool(self.api_key)
+        # Per event loop: the shared HTTP client the SDK was built on, the
+        # AsyncZep client, and the bulkhead semaphore capping in-flight Zep
+        # requests so fan-out here cannot take over the shared HTTP pool.
+        # All three are bound to the loop they were first used on.
+        self._loop_state: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Fail fast during a Zep outage instead of waiting out timeouts and
+        # retries on every call in the request path
+        self._breaker = CircuitBreaker("Zep")
+
+    @property
+    def client(self) -> Optional[AsyncZep]:
+        """
+        The AsyncZep client for the running event loop, built on first use.
+
+        Built lazily so a ZepClient can be created outside an event loop. The
+        SDK reuses the process-wide HTTP pool (HTTP/2 when enabled) instead of
+        opening its own; that pool is closed on shutdown. It gets the pool's
+        client without transport-level retries, as _call retries Zep requests
+        itself; for the same reason zep-cloud is kept below 4.0, whose SDK
+        retries requests by default. The SDK client is rebuilt whenever the
+        pool hands out a new HTTP client, e.g. after close_shared_async_client().
+        """
+        state = self._state()
+        return state[1] if state is not None else None
+
+    def _state(self) -> Optional[tuple]:
+        """Return (http client, AsyncZep, semaphore) for the running loop."""
+        if not self._available:
+            return None
+
+        loop = asyncio.get_running_loop()
+        http_client = get_shared_async_client(retries=False)
+        state = self._loop_state.get(loop)
+        if state is None or state[0] is not http_client:
             try:
-                self.client = AsyncZep(api_key=self.api_key)
+                zep = AsyncZep(api_key=self.api_key, httpx_client=http_client)
                 logger.debug("Zep client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Zep client: {e}")
-                self.client = None
+                self._available = False
+                return None
+            semaphore = (
+                state[2]
+                if state is not None
+                else asyncio.Semaphore(settings.zep_max_concurrency)
+            )
+            state = (http_client, zep, semaphore)
+            self._loop_state[loop] = state
+        return state
 
     def is_available(self) -> bool:
         """Check if Zep client is available and configured."""
-        return self.client is not None
+        return self._available
+
+    async def _call(
+        self,
+        fn: Callable[..., Awaitable[T]],
+        *args,
+        replay_safe: bool = True,
+        **kwargs,
+    ) -> T:
+        """
+        Await a Zep SDK call within the client's concurrency limit.
+
+        Transient failures are retried up to settings.zep_max_retries times
+        with exponential backoff and full jitter. Calls that are not
+        replay_safe are only retried when Zep rejected them with a 429, since
+        any other failure may have happened after Zep applied them.
+
+        Raises:
+            CircuitOpenError: If Zep has been failing and the call was
+                rejected without being sent
+        """
+        attempt = 0
+        while True:
+            self._breaker.check()
+            try:
+                async with self._state()[2]:
+                    result = await fn(*args, **kwargs)
+            except Exception as e:
+                if _is_server_failure(e):
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.record_success()
+                if attempt >= settings.zep_max_retries or not _is_transient(
+                    e, replay_safe
+                ):
+                    raise
+                delay = random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt))
+                logger.debug(f"Retrying Zep call in {delay:.2f}s after: {e}")
+            else:
+                self._breaker.record_success()
+                return result
+            attempt += 1
+            await asyncio.sleep(delay)
 
     # ============= USER MANAGEMENT =============
 
@@ -74,30 +207,88 @@ class ZepClient:
             logger.debug("Zep client not available, skipping user creation")
             return None
 
-        try:
-            # Try to get existing user
-            try:
-                user = await self.client.user.get(user_id=user_id)
-                logger.debug(f"Retrieved existing Zep user: {user_id}")
-                return user.model_dump() if hasattr(user, "model_dump") else dict(user)
-            except Exception:
+        user = self._known_users.get(user_id)
+        if user is not None:
+            return user
+
+        spec = {
+            "user_id": user_id,
+            "email": email,
+            "first_name": first_name,
+            "last_name": last_name,
+            "metadata": metadata,
+        }
+        (user,) = await self._inflight.do(
+            ("user", user_id), lambda: self.ensure_users([spec])
+        )
+        return user
+
+    async def ensure_users(self, specs: List[dict]) -> List[Optional[dict]]:
+        """
+        Get or create several users concurrently.
+
+        All users are looked up at once and the missing ones are then created
+        in a second concurrent batch, so any number of users costs about two
+        round-trips.
+
+        Args:
+            specs: User dicts with a 'user_id' key and optional 'email',
+                'first_name', 'last_name' and 'metadata' keys
+
+        Returns:
+            One user dict per spec, in order, or None where it failed
+        """
+        if not self.is_available():
+            return [None] * len(specs)
+
+        results = [self._known_users.get(spec["user_id"]) for spec in specs]
+        pending = [i for i, user in enumerate(results) if user is None]
+
+        found = await asyncio.gather(
+            *(
+                self._call(self.client.user.get, user_id=specs[i]["user_id"])
+                for i in pending
+            ),
+            return_exceptions=True,
+        )
+        missing = []
+        for i, user in zip(pending, found):
+            if isinstance(user, BaseException):
                 # User doesn't exist, create new one
-                logger.info(f"Creating new Zep user: {user_id}")
-
-                user = await self.client.user.add(
-                    user_id=user_id,
-                    email=email,
-                    first_name=first_name or "",
-                    last_name=last_name or "",
-                    metadata=metadata or {},
+                logger.info(f"Creating new Zep user: {specs[i]['user_id']}")
+                missing.append(i)
+            else:
+                results[i] = user
+
+        created = await asyncio.gather(
+            *(
+                self._call(
+                    self.client.user.add,
+                    user_id=specs[i]["user_id"],
+                    email=specs[i].get("email") or "",
+                    first_name=specs[i].get("first_name") or "",
+                    last_name=specs[i].get("last_name") or "",
+                    metadata=specs[i].get("metadata") or {},
+                    replay_safe=False,
                 )
-
+                for i in missing
+            ),
+            return_exceptions=True,
+        )
+        for i, user in zip(missing, created):
+            user_id = specs[i]["user_id"]
+            if isinstance(user, BaseException):
+                logger.error(f"Error creating/retrieving Zep user {user_id}: {user}")
+                results[i] = None
+            else:
                 logger.info(f"Successfully created Zep user: {user_id}")
-                return user.model_dump() if hasattr(user, "model_dump") else dict(user)
+                results[i] = user
 
-        except Exception as e:
-            logger.error(f"Error creating/retrieving Zep user {user_id}: {e}")
-            return None
+        for i in pending:
+            if results[i] is not None:
+                results[i] = _unwrap(results[i])
+                self._known_users.set(specs[i]["user_id"], results[i])
+        return results
 
     async def get_user(self, user_id: str) -> Optional[dict]:
         """Retrieve user by ID."""
@@ -105,8 +296,11 @@ class ZepClient:
             return None
 
         try:
-            user = await self.client.user.get(user_id=user_id)
-            return user.model_dump() if hasattr(user, "model_dump") else dict(user)
+            user = await self._inflight.do(
+                ("get_user", user_id),
+                lambda: self._call(self.client.user.get, user_id=user_id),
+            )
+            return _unwrap(user)
         except Exception as e:
             logger.debug(f"User {user_id} not found: {e}")
             return None
@@ -117,7 +311,8 @@ class ZepClient:
             return False
 
         try:
-            await self.client.user.delete(user_id=user_id)
+            await self._call(self.client.user.delete, user_id=user_id)
+            self._known_users.discard(user_id)
             logger.info(f"Deleted Zep user: {user_id}")
             return True
         except Exception as e:
@@ -145,14 +340,14 @@ class ZepClient:
             return None
 
         try:
-            thread = await self.client.thread.create(
+            thread = await self._call(
+                self.client.thread.create,
                 thread_id=thread_id,
                 user_id=user_id,
+                replay_safe=False,
             )
             logger.info(f"Created Zep thread: {thread_id} for user: {user_id}")
-            return (
-                thread.model_dump() if hasattr(thread, "model_dump") else dict(thread)
-            )
+            return _unwrap(thread)
         except Exception as e:
             logger.error(f"Error creating thread {thread_id}: {e}")
             return None
@@ -175,20 +370,37 @@ class ZepClient:
         if not self.is_available():
             return None
 
+        if self._known_threads.get(thread_id):
+            return {"thread_id": thread_id, "user_id": user_id}
+
+        return await self._inflight.do(
+            ("thread", thread_id), lambda: self._ensure_thread(thread_id, user_id)
+        )
+
+    async def _ensure_thread(self, thread_id: str, user_id: str) -> Optional[dict]:
+        # Probe first: by the time a thread is ensured it usually exists, and
+        # thread.get reports a missing one as a 404. thread.create has no
+        # documented status for an existing thread, so creating first would
+        # cost existing threads an extra round-trip.
         try:
-            # Try to get existing thread by getting its messages
-            try:
-                # thread.get returns messages, if it works the thread exists
-                await self.client.thread.get(thread_id=thread_id, lastn=1)
-                logger.debug(f"Thread {thread_id} exists")
-                return {"thread_id": thread_id, "user_id": user_id}
-            except Exception:
-                # Thread doesn't exist, create it
-                return await self.create_thread(thread_id=thread_id, user_id=user_id)
+            # thread.get returns messages, if it works the thread exists
+            await self._call(self.client.thread.get, thread_id=thread_id, lastn=1)
+            logger.debug(f"Thread {thread_id} exists")
+            result = {"thread_id": thread_id, "user_id": user_id}
+        except ApiError as e:
+            if e.status_code != 404:
+                logger.error(f"Error in get_or_create_thread {thread_id}: {e}")
+                return None
+            result = await self.create_thread(thread_id=thread_id, user_id=user_id)
+            if result is None:
+                return None
         except Exception as e:
             logger.error(f"Error in get_or_create_thread {thread_id}: {e}")
             return None
 
+        self._known_threads.set(thread_id, True)
+        return result
+
     async def get_thread_messages(
         self,
         thread_id: str,
@@ -210,18 +422,13 @@ class ZepClient:
             return []
 
         try:
-            response = await self.client.thread.get(
+            response = await self._call(
+                self.client.thread.get,
                 thread_id=thread_id,
                 limit=limit if not lastn else None,
                 lastn=lastn,
             )
-
-            if hasattr(response, "messages") and response.messages:
-                return [
-                    msg.model_dump() if hasattr(msg, "model_dump") else dict(msg)
-                    for msg in response.messages
-                ]
-            return []
+            return _unwrap_all(response.messages)
         except Exception as e:
             logger.error(f"Error getting messages for thread {thread_id}: {e}")
             return []
@@ -247,25 +454,22 @@ class ZepClient:
             return []
 
         try:
-            # Note: list_all may not support user_id filtering directly
-            response = await self.client.thread.list_all(
+            if user_id is not None:
+                # Filter server-side rather than paging through every thread
+                threads = (
+                    await self._call(self.client.user.get_threads, user_id=user_id)
+                    or []
+                )
+                start = (page - 1) * limit
+                return _unwrap_all(threads[start : start + limit])
+
+            response = await self._call(
+                self.client.thread.list_all,
                 page_number=page,
                 page_size=limit,
             )
 
-            threads = []
-            if hasattr(response, "threads") and response.threads:
-                for thread in response.threads:
-                    thread_dict = (
-                        thread.model_dump()
-                        if hasattr(thread, "model_dump")
-                        else dict(thread)
-                    )
-                    # Filter by user_id if specified
-                    if user_id is None or thread_dict.get("user_id") == user_id:
-                        threads.append(thread_dict)
-
-            return threads
+            return _unwrap_all(response.threads)
         except Exception as e:
             logger.error(f"Error listing threads: {e}")
             return []
@@ -276,7 +480,8 @@ class ZepClient:
             return False
 
         try:
-            await self.client.thread.delete(thread_id=thread_id)
+            await self._call(self.client.thread.delete, thread_id=thread_id)
+            self._known_threads.discard(thread_id)
             logger.info(f"Deleted Zep thread: {thread_id}")
             return True
         except Exception as e:
@@ -306,14 +511,11 @@ class ZepClient:
             return False
 
         try:
-            await self.client.thread.add_messages(
+            await self._call(
+                self.client.thread.add_messages,
                 thread_id=thread_id,
-                messages=[
-                    Message(
-                        role=role,
-                        content=content,
-                    )
-                ],
+                messages=[Message.model_construct(role=role, content=content)],
+                replay_safe=False,
             )
             logger.debug(f"Added {role} message to thread {thread_id}")
             return True
@@ -340,17 +542,20 @@ class ZepClient:
             return False
 
         try:
+            # Messages are built by our own code, so skip pydantic validation
             zep_messages = [
-                Message(
+                Message.model_construct(
                     role=msg.get("role", "user"),
                     content=msg.get("content", ""),
                 )
                 for msg in messages
             ]
 
-            await self.client.thread.add_messages(
+            await self._call(
+                self.client.thread.add_messages,
                 thread_id=thread_id,
                 messages=zep_messages,
+                replay_safe=False,
             )
             logger.debug(f"Added {len(messages)} messages to thread {thread_id}")
             return True
@@ -379,15 +584,12 @@ class ZepClient:
             return None
 
         try:
-            context = await self.client.thread.get_context(
+            context = await self._call(
+                self.client.thread.get_context,
                 thread_id=thread_id,
                 min_rating=min_rating,
             )
-            return (
-                context.model_dump()
-                if hasattr(context, "model_dump")
-                else dict(context)
-            )
+            return _unwrap(context)
         except Exception as e:
             logger.error(f"Error getting context for thread {thread_id}: {e}")
             return None
@@ -433,16 +635,13 @@ class ZepClient:
             if graph_id:
                 search_kwargs["graph_id"] = graph_id
 
-            results = await self.client.graph.search(**search_kwargs)
+            results = await self._inflight.do(
+                ("search_graph", query, user_id, graph_id, limit),
+                lambda: self._call(self.client.graph.search, **search_kwargs),
+            )
 
             # Extract edges from results
-            if hasattr(results, "edges"):
-                return [
-                    edge.model_dump() if hasattr(edge, "model_dump") else dict(edge)
-                    for edge in (results.edges or [])
-                ]
-
-            return []
+            return _unwrap_all(results.edges)
         except Exception as e:
             logger.error(f"Error searching Zep graph: {e}")
             return []
@@ -465,7 +664,7 @@ class ZepClient:
             return False
 
         try:
-            await self.client.user.warm(user_id=user_id)
+            await self._call(self.client.user.warm, user_id=user_id)
             logger.debug(f"Warmed cache for user: {user_id}")
             return True
         except Exception as e:
@@ -475,11 +674,14 @@ class ZepClient:
 
 # Singleton instance
 _zep_client: Optional[ZepClient] = None
+_zep_client_lock = threading.Lock()
 
 
 def get_zep_client() -> ZepClient:
     """Get the singleton Zep client instance."""
     global _zep_client
     if _zep_client is None:
-        _zep_client = ZepClient()
+        with _zep_client_lock:
+            if _zep_client is None:
+                _zep_client = ZepClient()
     return _zep_client
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pydantic import BaseModel, Field
 from typing import Any, Optional
 
@@ -10,6 +11,14 @@ from megamind.factories import LLMFactory
 from megamind.utils.config import settings
 
 
+# Map provider names to Deep Agents format
+_PROVIDER_MAP = {
+    "GEMINI": "google",
+    "CLAUDE": "anthropic",
+    "OPENAI": "openai",
+}
+
+
 class Configuration(BaseModel):
     """The configuration for the agent."""
 
@@ -94,21 +103,7 @@ class Configuration(BaseModel):
             str: Model string like "google:gemini-2.5-flash" or "anthropic:claude-sonnet-4-20250514"
         """
         model = custom_model or settings.model or self.query_generator_model
-
-        # Map provider names to Deep Agents format
-        provider_map = {
-            "GEMINI": "google",
-            "CLAUDE": "anthropic",
-            "OPENAI": "openai",
-        }
-        provider = provider_map.get(settings.provider.upper())
-
-        if provider:
-            return f"{provider}:{model}"
-        else:
-            # For unsupported providers (KIMI, DEEPSEEK), return None
-            # Caller should use get_chat_model() instead
-            return None
+        return _model_string(settings.provider, model)
 
     def get_model_for_deep_agent(self, custom_model: str = None):
         """
@@ -154,3 +149,13 @@ class Configuration(BaseModel):
             api_key=api_key,
             **kwargs,
         )
+
+
+@lru_cache(maxsize=32)
+def _model_string(provider: str, model: str) -> str | None:
+    deep_agents_provider = _PROVIDER_MAP.get(provider.upper())
+    if deep_agents_provider:
+        return f"{deep_agents_provider}:{model}"
+    # For unsupported providers (KIMI, DEEPSEEK), return None
+    # Caller should use get_chat_model() instead
+    return None
@@ -20,7 +20,7 @@ from loguru import logger
 from pydantic import ValidationError
 
 from megamind import prompts
-from megamind.clients.titan_client import TitanClient
+from megamind.clients.titan_client import TitanClient, get_titan_client
 from megamind.configuration import Configuration
 from megamind.graph.schemas import KnowledgeExtractionResult, KnowledgeEntrySchema
 from megamind.graph.states import AgentState
@@ -127,20 +127,26 @@ async def _extract_and_save_knowledge(state: AgentState, config: RunnableConfig)
         logger.info(f"Entry type distribution: {type_counts}")
 
         # Save each knowledge entry
-        titan_client = TitanClient()
+        titan_client = get_titan_client()
         logger.debug("Initialized Titan client for knowledge save operations")
 
+        # Entries are independent, so save them concurrently over the shared
+        # connection pool; one failure does not stop the others
+        results = await asyncio.gather(
+            *(
+                _save_knowledge_entry(entry, titan_client)
+                for entry in extraction_result.entries
+            ),
+            return_exceptions=True,
+        )
+
         failed_count = 0
-        for idx, entry in enumerate(extraction_result.entries, 1):
-            logger.debug(
-                f"Processing entry {idx}/{len(extraction_result.entries)}: '{entry.title}'"
-            )
-            try:
-                await _save_knowledge_entry(entry, titan_client)
-            except Exception as e:
+        for entry, result in zip(extraction_result.entries, results):
+            if isinstance(result, Exception):
                 failed_count += 1
-                logger.error(f"Failed to save knowledge entry '{entry.title}': {e}")
-                # Continue with next entry even if one fails
+                logger.error(
+                    f"Failed to save knowledge entry '{entry.title}': {result}"
+                )
 
         successful_saves = len(extraction_result.entries) - failed_count
         logger.info(
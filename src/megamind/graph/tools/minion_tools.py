@@ -1,6 +1,5 @@
 from langchain_core.tools import tool
-from megamind.clients.minion_client import MinionClient
-from megamind.utils.config import settings
+from megamind.clients.minion_client import get_minion_client
 
 
 @tool
@@ -17,6 +16,6 @@ async def search_document(query: str) -> str:
     Returns:
         Matching documents ranked by relevance
     """
-    client = MinionClient(settings.minion_api_url)
+    client = get_minion_client()
     result = await client.search_document(query)
     return str(result)
@@ -184,11 +184,10 @@ async def call_report_analyst(query: str) -> str:
     logger.debug("---REPORT ANALYST TOOL---")
 
     config = Configuration()
-    mcp_client = client_manager.get_client()
     llm = config.get_chat_model()
 
     # Get MCP tools (no wrapping - middleware handles token injection)
-    all_mcp_tools = await mcp_client.get_tools()
+    all_mcp_tools = await client_manager.get_tools()
     filtered_mcp_tools = [t for t in all_mcp_tools if t.name in REPORT_MCP_TOOL_NAMES]
 
     agent = create_agent(
@@ -228,11 +227,10 @@ async def call_operations_specialist(query: str) -> str:
     logger.debug("---OPERATIONS SPECIALIST TOOL---")
 
     config = Configuration()
-    mcp_client = client_manager.get_client()
     llm = config.get_chat_model()
 
     # Get MCP tools (no wrapping - middleware handles token injection)
-    all_mcp_tools = await mcp_client.get_tools()
+    all_mcp_tools = await client_manager.get_tools()
     filtered_mcp_tools = [
         t for t in all_mcp_tools if t.name in OPERATIONS_MCP_TOOL_NAMES
     ]
@@ -9,7 +9,7 @@ from typing import Optional
 from langchain_core.tools import tool
 from loguru import logger
 
-from megamind.clients.titan_client import TitanClient
+from megamind.clients.titan_client import get_titan_client
 
 
 @tool
@@ -72,7 +72,7 @@ async def search_erpnext_knowledge(
 
     try:
         # Create Titan client
-        titan_client = TitanClient()
+        titan_client = get_titan_client()
 
         # Search knowledge
         results = await titan_client.search_knowledge(
@@ -155,7 +155,7 @@ async def get_erpnext_knowledge_by_id(knowledge_id: int) -> str:
     logger.info(f"Tool called: get_erpnext_knowledge_by_id(knowledge_id={knowledge_id})")
 
     try:
-        titan_client = TitanClient()
+        titan_client = get_titan_client()
         entry = await titan_client.get_knowledge_by_id(knowledge_id)
 
         if not entry:
@@ -125,8 +125,7 @@ async def get_report_tools() -> list[BaseTool]:
     Knowledge context (report filters, best practices) should be provided
     in the task description by the orchestrator after consulting knowledge subagent.
     """
-    mcp_client = client_manager.get_client()
-    all_tools = await mcp_client.get_tools()
+    all_tools = await client_manager.get_tools()
 
     # Filter to report tools only - no knowledge tools
     return [t for t in all_tools if t.name in REPORT_MCP_TOOL_NAMES]
@@ -143,8 +142,7 @@ async def get_operations_tools() -> list[BaseTool]:
     Required field validation and best practices should be provided
     in the task description by the orchestrator after consulting knowledge subagent.
     """
-    mcp_client = client_manager.get_client()
-    all_tools = await mcp_client.get_tools()
+    all_tools = await client_manager.get_tools()
 
     # Filter to operations tools only - no knowledge tools
     return [t for t in all_tools if t.name in OPERATIONS_MCP_TOOL_NAMES]
@@ -173,7 +171,7 @@ async def build_subagent_graph(
     logger.info("Building subagent-based megamind graph")
 
     # Initialize MCP client
-    client_manager.initialize_client()
+    await client_manager.initialize_client()
 
     # Get configuration and model
     config = Configuration()
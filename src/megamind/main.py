@@ -17,6 +17,9 @@ from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from psycopg_pool import AsyncConnectionPool
 
 from megamind.clients.frappe_client import FrappeClient
+from megamind.clients.http_pool import close_shared_async_client
+from megamind.clients.mcp_client_manager import client_manager
+from megamind.clients.minion_client import get_minion_client
 from megamind.clients.zep_client import get_zep_client
 from megamind.graph.nodes.integrations.reconciliation_model import merge_customer_data
 from megamind.graph.workflows.subagent_graph import build_subagent_graph
@@ -80,6 +83,10 @@ async def lifespan(app: FastAPI):
                 "Zep client not configured. Knowledge Graph features disabled."
             )
 
+        # Warm up Minion connection pool so the first search skips the handshake
+        minion_client = get_minion_client()
+        await minion_client.startup()
+
         # Build graphs
         logger.info("Building document search graph")
         document_search_graph = await build_document_search_graph(
@@ -115,9 +122,13 @@ async def lifespan(app: FastAPI):
 
     # Graceful shutdown
     logger.info("Shutting down application...")
+    await client_manager.cleanup()
+    await get_minion_client().aclose()
+    await close_shared_async_client()
     await pool.close()
     logger.info("PostgreSQL connection pool closed")
     logger.info("Application shutdown complete")
+    await logger.complete()
 
 
 if settings.sentry_dsn:
@@ -223,12 +234,15 @@ async def _handle_chat_stream(
         thread_state = await checkpointer.aget(config)
         messages = []
 
+        # Get user context for the Deep Agent orchestrator prompt and Zep
+        frappe_client = FrappeClient(access_token=access_token)
+        company, user_info = await frappe_client.gather_user_context()
+        current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S %Z")
+
         # Get user info for Zep user management
         user_id = None
         if zep_client.is_available():
             try:
-                frappe_client = FrappeClient(access_token=access_token)
-                user_info = frappe_client.get_current_user_info()
                 user_id = user_info.get("email") or user_info.get("name")
 
                 # Ensure user and thread exist in Zep
@@ -247,12 +261,6 @@ async def _handle_chat_stream(
                 logger.warning(f"Failed to setup Zep user/thread: {e}")
                 user_id = None
 
-        # Get user context for Deep Agent orchestrator prompt
-        frappe_client = FrappeClient(access_token=access_token)
-        company = frappe_client.get_default_company()
-        user_info = frappe_client.get_current_user_info()
-        current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S %Z")
-
         logger.debug(f"Using company: {company}")
         logger.info(
             f"User context loaded: {user_info.get('full_name', 'Unknown')} ({user_info.get('email', 'Unknown')})"
@@ -304,18 +312,6 @@ async def _handle_chat_stream(
             logger.debug(f"Processing user question for thread: {thread}")
             messages.append(HumanMessage(content=request_data.query))
 
-            # Sync user message to Zep (fire and forget)
-            if zep_client.is_available() and user_id:
-                try:
-                    await zep_client.add_message(
-                        thread_id=thread,
-                        role="user",
-                        content=request_data.query,
-                    )
-                    logger.debug(f"Synced user message to Zep thread: {thread}")
-                except Exception as e:
-                    logger.warning(f"Failed to sync user message to Zep: {e}")
-
         inputs = {
             "messages": messages,
             "access_token": access_token,
@@ -329,6 +325,8 @@ async def _handle_chat_stream(
             provider=settings.provider,
             zep_client=zep_client if zep_client.is_available() else None,
             zep_thread_id=thread,
+            # Synced in the background once the stream starts
+            zep_user_message=request_data.query if user_id else None,
         )
 
     except HTTPException as e:
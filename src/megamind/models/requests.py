@@ -28,6 +28,11 @@ class DocumentExtractionRequest(BaseModel):
     file_names: list[DocumentRequestBody]
 
 
+class TitanProcessRequest(BaseModel):
+    file_names: list[DocumentRequestBody]
+    callback_url: str
+
+
 class TitanCallbackRequest(BaseModel):
     documents: list[str]
 
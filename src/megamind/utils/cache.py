@@ -0,0 +1,216 @@
+"""In-process caching helpers for megamind.
+
+Service clients use these to avoid repeating read-only network calls that
+agents issue many times within a single reasoning loop.
+"""
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """
+    A bounded least-recently-used cache whose entries expire after a TTL.
+
+    Expired entries are not served by get() but are kept until evicted, so
+    callers can fall back to them via get_stale() when the upstream is down.
+
+    Not thread-safe; intended for use from the event loop only.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key even if it has expired."""
+        entry = self._data.get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the entry for key, if any."""
+        self._data.pop(key, None)
+
+    def invalidate(self, prefix: Optional[str] = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            prefix: When given, only drop tuple keys whose first element starts
+                with this string. Otherwise clear the whole cache.
+        """
+        if prefix is None:
+            self._data.clear()
+            return
+        for key in [
+            k
+            for k in self._data
+            if isinstance(k, tuple) and k and str(k[0]).startswith(prefix)
+        ]:
+            del self._data[key]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """
+    A bounded cache of query results keyed by query-embedding similarity.
+
+    Lookups embed the query and return the cached result of the most similar
+    earlier query within the same scope, provided the cosine similarity
+    reaches the threshold. Near-duplicate rephrasings then skip the remote
+    call entirely. Every lookup costs one embedding call, hit or miss.
+
+    Embeddings are kept in one preallocated matrix, so a lookup scores all
+    entries with a single matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], Awaitable[list[float]]],
+        threshold: float = 0.9,
+        maxsize: int = 256,
+        ttl: float = 300.0,
+    ):
+        self._embed_fn = embed_fn
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # slot -> (expires_at, scope, value), least recently used first. The
+        # slot's normalized embedding is row `slot` of self._vectors.
+        self._data: OrderedDict[int, tuple[float, Hashable, Any]] = OrderedDict()
+        self._free_slots = list(range(maxsize - 1, -1, -1))
+        self._vectors: Optional[np.ndarray] = None
+
+    async def lookup(
+        self, query: str, scope: Hashable = None
+    ) -> tuple[np.ndarray, Optional[Any]]:
+        """
+        Find a cached result for a query similar to this one.
+
+        Returns:
+            The query's normalized embedding, to pass back to put() on a miss,
+            and the cached value or None.
+        """
+        vector = _normalize(await self._embed_fn(query))
+        now = time.monotonic()
+        candidates = []
+        for slot, (expires_at, entry_scope, _) in list(self._data.items()):
+            if expires_at < now:
+                del self._data[slot]
+                self._free_slots.append(slot)
+            elif entry_scope == scope:
+                candidates.append(slot)
+        if not candidates:
+            return vector, None
+
+        scores = self._vectors[candidates] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return vector, None
+        slot = candidates[best]
+        self._data.move_to_end(slot)
+        return vector, self._data[slot][2]
+
+    def put(self, vector: np.ndarray, value: Any, scope: Hashable = None) -> None:
+        """Store a result under the normalized embedding returned by lookup()."""
+        if self._vectors is None:
+            self._vectors = np.zeros((self.maxsize, len(vector)), dtype=np.float32)
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot, _ = self._data.popitem(last=False)
+        self._vectors[slot] = vector
+        self._data[slot] = (time.monotonic() + self.ttl, scope, value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one underlying call.
+
+    While a call for a key is in flight, later callers with the same key await
+    its result instead of starting their own. Every caller receives the same
+    result object, so callers must not mutate it.
+
+    Calls are only shared within an event loop, as their tasks are bound to
+    the loop that started them.
+    """
+
+    def __init__(self):
+        self._inflight: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[Hashable, asyncio.Future]
+        ] = weakref.WeakKeyDictionary()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() for key, or join the call already in flight for it.
+
+        The call runs in its own task, so one caller being cancelled does not
+        cancel it for the others.
+        """
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(inflight, key, done))
+        return await asyncio.shield(task)
+
+    def cancel_all(self) -> None:
+        """Cancel every call still in flight on the running event loop."""
+        inflight = self._inflight.pop(asyncio.get_running_loop(), {})
+        for task in inflight.values():
+            task.cancel()
+
+    @staticmethod
+    def _forget(
+        inflight: dict[Hashable, asyncio.Future], key: Hashable, task: asyncio.Future
+    ) -> None:
+        if inflight.get(key) is task:
+            del inflight[key]
+
+
+def _normalize(vector: list[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+def freeze(value: Any) -> Hashable:
+    """Convert dicts and lists of request params into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
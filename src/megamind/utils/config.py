@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     frappe_api_secret: str
     frappe_auth_mode: str = "jwt"
     frappe_mcp_server_path: str = "none"
+    mcp_session_open_timeout: float = 30.0  # Seconds startup waits for MCP sessions
 
     # Supabase Configuration
     supabase_url: str
@@ -48,9 +49,24 @@ class Settings(BaseSettings):
     # Application Configuration
     log_level: str = "INFO"
     json_logs: bool = False
+    log_debug_sample_rate: float = 1.0  # Fraction of DEBUG records kept: 1.0 = all
     minion_api_url: str = "http://localhost:8000"
+    # Serve similar searches from cache. Every search then first embeds its
+    # query, an extra embedding API round trip even on a cache miss.
+    minion_semantic_cache_enabled: bool = False
+    minion_semantic_cache_threshold: float = 0.9  # Minimum query cosine similarity
+    minion_semantic_cache_ttl: float = 300.0  # Seconds a cached search stays fresh
     titan_api_url: str = "http://localhost:8001"
     tenant_id: str = "aimlink"
+    titan_cache_ttl: float = 300.0  # Seconds a cached Titan knowledge read stays fresh
+    titan_cache_maxsize: int = 512  # Maximum cached Titan knowledge reads
+
+    # Shared HTTP Client Pool Configuration
+    http_max_connections: int = 200  # Maximum concurrent outbound connections
+    http_max_keepalive: int = 50  # Idle connections kept open for reuse
+    http2_enabled: bool = True  # Multiplex concurrent requests over one connection
+    http_connect_retries: int = 3  # Retries for failed connection attempts
+    http_request_retries: int = 2  # Retries for idempotent requests on 5xx/429
 
     # Sentry Configuration
     sentry_dsn: str = ""
@@ -63,6 +79,8 @@ class Settings(BaseSettings):
 
     # Zep Configuration
     zep_api_key: str = ""
+    zep_max_concurrency: int = 20  # Maximum in-flight Zep API requests
+    zep_max_retries: int = 2  # Retries for transient Zep API failures
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,4 +1,5 @@
 import logging
+import random
 import sys
 
 from loguru import logger
@@ -25,6 +26,13 @@ class InterceptHandler(logging.Handler):
         )
 
 
+def _sample_debug(record) -> bool:
+    """Keep only a sampled fraction of DEBUG records."""
+    if record["level"].no > logging.DEBUG:
+        return True
+    return random.random() < settings.log_debug_sample_rate
+
+
 def setup_logging():
     # intercept everything at the root logger
     logging.root.handlers = [InterceptHandler()]
@@ -43,6 +51,10 @@ def setup_logging():
                 "sink": sys.stdout,
                 "serialize": settings.json_logs,
                 "colorize": not settings.json_logs,
+                # Records are still formatted in the calling thread; only the
+                # write to stdout is handed to a background thread
+                "enqueue": True,
+                "filter": _sample_debug,
             }
         ]
     )
@@ -1,7 +1,17 @@
 import asyncio
 from fastapi.responses import StreamingResponse
 from loguru import logger
-import json
+import orjson
+
+
+def format_sse_event(event: str, data: dict) -> bytes:
+    """
+    Encode a server-sent event with an orjson-serialized JSON payload.
+
+    orjson emits UTF-8 bytes directly, so the payload never round-trips
+    through an intermediate str.
+    """
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
 
 
 def extract_text_content(content):
@@ -34,8 +44,19 @@ def extract_text_content(content):
     return str(content)
 
 
+# Holds background Zep sync tasks until they finish; the event loop keeps only
+# weak references to tasks, and the stream may be closed first.
+_background_tasks: set[asyncio.Task] = set()
+
+
 async def stream_response_with_ping(
-    graph, inputs, config, provider=None, zep_client=None, zep_thread_id=None
+    graph,
+    inputs,
+    config,
+    provider=None,
+    zep_client=None,
+    zep_thread_id=None,
+    zep_user_message=None,
 ):
     """
     Streams responses from the graph with agent status visibility.
@@ -56,8 +77,10 @@ async def stream_response_with_ping(
         inputs: Input data for the graph
         config: Configuration for the graph
         provider: Optional provider name (reserved for future provider-specific processing)
-        zep_client: Optional ZepClient for syncing AI response to Zep thread
+        zep_client: Optional ZepClient for syncing the turn to Zep thread
         zep_thread_id: Thread ID for Zep message sync
+        zep_user_message: Optional user message to sync to the Zep thread in
+            the background while the response streams
     """
     queue = asyncio.Queue()
 
@@ -212,8 +235,26 @@ async def stream_response_with_ping(
         finally:
             await queue.put(None)  # Signal completion
 
+    async def sync_user_message():
+        try:
+            await zep_client.add_message(
+                thread_id=zep_thread_id,
+                role="user",
+                content=zep_user_message,
+            )
+            logger.debug(f"Synced user message to Zep thread: {zep_thread_id}")
+        except Exception as e:
+            logger.warning(f"Failed to sync user message to Zep: {e}")
+
     async def response_generator():
         producer_task = asyncio.create_task(stream_producer())
+        user_sync_task = None
+        if zep_client and zep_thread_id and zep_user_message:
+            # Synced in the background as the stream starts, so the message is
+            # kept even if the client disconnects before the stream completes
+            user_sync_task = asyncio.create_task(sync_user_message())
+            _background_tasks.add(user_sync_task)
+            user_sync_task.add_done_callback(_background_tasks.discard)
         while True:
             try:
                 item = await asyncio.wait_for(queue.get(), timeout=2.0)
@@ -224,6 +265,9 @@ async def stream_response_with_ping(
                         # Decode tokens back to readable text
                         full_response = full_response.replace("|new_line|", "\n")
                         full_response = full_response.replace("|space|", " ")
+                        if user_sync_task is not None:
+                            # Keep the user message ahead of the reply
+                            await user_sync_task
                         try:
                             await zep_client.add_message(
                                 thread_id=zep_thread_id,
@@ -243,26 +287,22 @@ async def stream_response_with_ping(
                     event_type = item.get("type", "stream_event")
 
                     if event_type == "agent_tool_call":
-                        data = json.dumps(
+                        yield format_sse_event(
+                            "agent_tool_call",
                             {
                                 "agent": item.get("agent"),
                                 "tool": item.get("tool"),
                                 "input_preview": item.get("input_preview", ""),
-                            }
-                        )
-                        yield f"event: agent_tool_call\ndata: {data}\n\n".encode(
-                            "utf-8"
+                            },
                         )
 
                     elif event_type == "agent_reasoning":
-                        data = json.dumps(
+                        yield format_sse_event(
+                            "agent_reasoning",
                             {
                                 "agent": item.get("agent"),
                                 "content": item.get("content", ""),
-                            }
-                        )
-                        yield f"event: agent_reasoning\ndata: {data}\n\n".encode(
-                            "utf-8"
+                            },
                         )
 
                     elif event_type == "stream_event":
@@ -270,14 +310,14 @@ async def stream_response_with_ping(
                         agent = item.get("agent")
                         # Collect for Zep sync
                         ai_response_content.append(content)
-                        data = json.dumps({"agent": agent, "content": content})
-                        yield f"event: stream_event\ndata: {data}\n\n".encode("utf-8")
+                        yield format_sse_event(
+                            "stream_event", {"agent": agent, "content": content}
+                        )
 
                     elif event_type == "error":
-                        data = json.dumps(
-                            {"message": item.get("message", "Unknown error")}
+                        yield format_sse_event(
+                            "error", {"message": item.get("message", "Unknown error")}
                         )
-                        yield f"event: error\ndata: {data}\n\n".encode("utf-8")
                 else:
                     # Legacy string content
                     ai_response_content.append(str(item))
@@ -288,9 +328,7 @@ async def stream_response_with_ping(
             except Exception as e:
                 logger.error(f"Error in response generator: {e}")
                 error_data = {"message": "An error occurred during the stream."}
-                yield f"event: error\ndata: {json.dumps(error_data)}\n\n".encode(
-                    "utf-8"
-                )
+                yield format_sse_event("error", error_data)
                 break
         await producer_task
 
@@ -1,6 +1,43 @@
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add the 'src' directory to the Python path for test discovery
 src_path = Path(__file__).resolve().parent.parent / "src"
 sys.path.insert(0, str(src_path))
+
+# Settings are loaded at import time; required ones get placeholder values so
+# modules can be imported without a .env file
+for name in (
+    "FRAPPE_URL",
+    "FRAPPE_API_KEY",
+    "FRAPPE_API_SECRET",
+    "SUPABASE_URL",
+    "SUPABASE_KEY",
+    "SUPABASE_CONNECTION_STRING",
+):
+    os.environ.setdefault(name, "test")
+
+
+class FakeClock:
+    """Stands in for the time module; tests move time on by adding to now."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the monotonic clock the caches and circuit breakers read."""
+    from megamind.clients import circuit_breaker
+    from megamind.utils import cache
+
+    clock = FakeClock()
+    for module in (cache, circuit_breaker):
+        monkeypatch.setattr(module, "time", clock)
+    return clock
@@ -0,0 +1,266 @@
+import asyncio
+import threading
+
+import pytest
+
+from megamind.utils.cache import SemanticCache, SingleFlight, TTLCache
+
+
+class TestTTLCache:
+    def test_get_returns_value_until_ttl_expires(self, clock):
+        ttl_cache = TTLCache(maxsize=4, ttl=10.0)
+        ttl_cache.set("a", 1)
+
+        clock.now += 9.0
+        assert ttl_cache.get("a") == 1
+
+        clock.now += 2.0
+        assert ttl_cache.get("a") is None
+
+    def test_per_entry_ttl_overrides_default(self, clock):
+        ttl_cache = TTLCache(maxsize=4, ttl=10.0)
+        ttl_cache.set("a", 1, ttl=1.0)
+
+        clock.now += 2.0
+        assert ttl_cache.get("a") is None
+
+    def test_get_stale_serves_expired_entries(self, clock):
+        ttl_cache = TTLCache(maxsize=4, ttl=10.0)
+        ttl_cache.set("a", 1)
+
+        clock.now += 60.0
+        assert ttl_cache.get("a") is None
+        assert ttl_cache.get_stale("a") == 1
+        assert ttl_cache.get_stale("missing") is None
+
+    def test_evicts_least_recently_used(self, clock):
+        ttl_cache = TTLCache(maxsize=2, ttl=10.0)
+        ttl_cache.set("a", 1)
+        ttl_cache.set("b", 2)
+        # Reading "a" makes "b" the least recently used entry
+        assert ttl_cache.get("a") == 1
+
+        ttl_cache.set("c", 3)
+
+        assert len(ttl_cache) == 2
+        assert ttl_cache.get("b") is None
+        assert ttl_cache.get("a") == 1
+        assert ttl_cache.get("c") == 3
+
+    def test_discard(self, clock):
+        ttl_cache = TTLCache(maxsize=4, ttl=10.0)
+        ttl_cache.set("a", 1)
+
+        ttl_cache.discard("a")
+        ttl_cache.discard("missing")
+
+        assert ttl_cache.get_stale("a") is None
+
+    def test_invalidate_by_prefix(self, clock):
+        ttl_cache = TTLCache(maxsize=8, ttl=10.0)
+        ttl_cache.set(("user:1", "a"), 1)
+        ttl_cache.set(("user:2", "a"), 2)
+        ttl_cache.set("plain", 3)
+
+        ttl_cache.invalidate("user:1")
+
+        assert ttl_cache.get(("user:1", "a")) is None
+        assert ttl_cache.get(("user:2", "a")) == 2
+        assert ttl_cache.get("plain") == 3
+
+        ttl_cache.invalidate()
+        assert len(ttl_cache) == 0
+
+
+class TestSemanticCache:
+    @staticmethod
+    def _cache(**kwargs) -> SemanticCache:
+        vectors = {
+            "q1": [1.0, 0.0, 0.0],
+            "q1 again": [0.99, 0.1, 0.0],
+            "q2": [0.0, 1.0, 0.0],
+            "q3": [0.0, 0.0, 1.0],
+        }
+
+        async def embed(query: str) -> list[float]:
+            return vectors[query]
+
+        return SemanticCache(embed, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_serves_similar_query(self, clock):
+        semantic_cache = self._cache(threshold=0.9)
+        vector, cached = await semantic_cache.lookup("q1")
+        assert cached is None
+        semantic_cache.put(vector, "result 1")
+
+        _, cached = await semantic_cache.lookup("q1 again")
+        assert cached == "result 1"
+
+        _, cached = await semantic_cache.lookup("q2")
+        assert cached is None
+
+    @pytest.mark.asyncio
+    async def test_scopes_are_isolated(self, clock):
+        semantic_cache = self._cache()
+        vector, _ = await semantic_cache.lookup("q1", scope="a")
+        semantic_cache.put(vector, "result", scope="a")
+
+        _, cached = await semantic_cache.lookup("q1", scope="b")
+        assert cached is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_dropped(self, clock):
+        semantic_cache = self._cache(ttl=10.0)
+        vector, _ = await semantic_cache.lookup("q1")
+        semantic_cache.put(vector, "result")
+
+        clock.now += 11.0
+        _, cached = await semantic_cache.lookup("q1")
+
+        assert cached is None
+        assert len(semantic_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, clock):
+        semantic_cache = self._cache(maxsize=2)
+        for query in ("q1", "q2"):
+            vector, _ = await semantic_cache.lookup(query)
+            semantic_cache.put(vector, query)
+        # Hitting q1 makes q2 the least recently used entry
+        assert (await semantic_cache.lookup("q1"))[1] == "q1"
+
+        vector, _ = await semantic_cache.lookup("q3")
+        semantic_cache.put(vector, "q3")
+
+        assert len(semantic_cache) == 2
+        assert (await semantic_cache.lookup("q2"))[1] is None
+        assert (await semantic_cache.lookup("q1"))[1] == "q1"
+        assert (await semantic_cache.lookup("q3"))[1] == "q3"
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_coalesces_concurrent_calls(self):
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.create_task(flight.do("key", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["result"] * 3
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_runs_again_once_call_completes(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("key", fetch) == 1
+        assert await flight.do("key", fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "result"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        release.set()
+
+        assert await second == "result"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_every_caller(self):
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            raise ValueError("upstream failed")
+
+        waiters = [asyncio.create_task(flight.do("key", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert calls == 1
+        assert all(isinstance(result, ValueError) for result in results)
+
+        # A failed call is not cached
+        release.clear()
+        retry = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(ValueError):
+            await retry
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancel_all_cancels_inflight_calls(self):
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.Event().wait()
+
+        waiter = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+
+        flight.cancel_all()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    def test_calls_are_not_shared_across_event_loops(self):
+        flight = SingleFlight()
+        both_started = threading.Barrier(2)
+        results = {}
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return threading.current_thread().name
+
+        async def caller():
+            task = asyncio.create_task(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            both_started.wait(timeout=1)
+            return await task
+
+        def run(name):
+            results[name] = asyncio.run(caller())
+
+        threads = [
+            threading.Thread(target=run, args=(name,), name=name)
+            for name in ("loop-1", "loop-2")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {"loop-1": "loop-1", "loop-2": "loop-2"}
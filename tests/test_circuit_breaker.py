@@ -0,0 +1,64 @@
+import pytest
+
+from megamind.clients.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test", fail_threshold=3, reset_after=30.0)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.check()
+    assert not breaker.is_open
+
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker("test", fail_threshold=2, reset_after=30.0)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert not breaker.is_open
+
+
+def test_lets_calls_through_after_reset_window(clock):
+    breaker = CircuitBreaker("test", fail_threshold=1, reset_after=30.0)
+    breaker.record_failure()
+    assert breaker.is_open
+
+    clock.now += 31.0
+
+    assert not breaker.is_open
+    breaker.check()
+
+
+def test_failure_after_reset_window_reopens_immediately(clock):
+    breaker = CircuitBreaker("test", fail_threshold=3, reset_after=30.0)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 31.0
+
+    breaker.record_failure()
+
+    assert breaker.is_open
+
+
+def test_success_after_reset_window_closes(clock):
+    breaker = CircuitBreaker("test", fail_threshold=1, reset_after=30.0)
+    breaker.record_failure()
+    clock.now += 31.0
+
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.is_open
+
+    clock.now += 31.0
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.check()
@@ -0,0 +1,212 @@
+import asyncio
+
+import httpcore
+import httpx
+import pytest
+
+from megamind.clients.http_pool import (
+    IDEMPOTENT,
+    RetryTransport,
+    close_shared_async_client,
+    get_shared_async_client,
+)
+from megamind.utils.config import settings
+
+
+class ScriptedTransport(httpx.AsyncBaseTransport):
+    """Replays a fixed sequence of responses or exceptions, one per request."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome[0], headers=outcome[1], request=request)
+
+
+def _client(transport: ScriptedTransport, **kwargs) -> httpx.AsyncClient:
+    kwargs.setdefault("backoff", 0.0)
+    return httpx.AsyncClient(
+        transport=RetryTransport(transport, **kwargs), base_url="http://test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_retries_get_on_retryable_status():
+    transport = ScriptedTransport((503, {}), (200, {}))
+    async with _client(transport) as client:
+        response = await client.get("/")
+
+    assert response.status_code == 200
+    assert transport.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_other_statuses():
+    transport = ScriptedTransport((500, {}), (200, {}))
+    async with _client(transport) as client:
+        response = await client.get("/")
+
+    assert response.status_code == 500
+    assert transport.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries():
+    transport = ScriptedTransport((503, {}))
+    async with _client(transport, max_retries=2) as client:
+        response = await client.get("/")
+
+    assert response.status_code == 503
+    assert transport.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_never_replays_post():
+    transport = ScriptedTransport((503, {}), (200, {}))
+    async with _client(transport) as client:
+        response = await client.post("/", json={})
+
+    assert response.status_code == 503
+    assert transport.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_post_marked_idempotent():
+    transport = ScriptedTransport((503, {}), (200, {}))
+    async with _client(transport) as client:
+        response = await client.post("/", json={}, extensions={IDEMPOTENT: True})
+
+    assert response.status_code == 200
+    assert transport.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_retries_get_on_dropped_connection():
+    transport = ScriptedTransport(httpx.RemoteProtocolError("closed"), (200, {}))
+    async with _client(transport) as client:
+        response = await client.get("/")
+
+    assert response.status_code == 200
+    assert transport.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_post_on_dropped_connection():
+    transport = ScriptedTransport(httpx.RemoteProtocolError("closed"), (200, {}))
+    async with _client(transport) as client:
+        with pytest.raises(httpx.RemoteProtocolError):
+            await client.post("/", json={})
+
+    assert transport.calls == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error", [httpx.ConnectError("refused"), httpx.ConnectTimeout("timed out")]
+)
+async def test_leaves_connect_errors_to_inner_transport(error):
+    transport = ScriptedTransport(error, (200, {}))
+    async with _client(transport) as client:
+        with pytest.raises(type(error)):
+            await client.get("/")
+
+    assert transport.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_read_timeout():
+    transport = ScriptedTransport(httpx.ReadTimeout("slow"), (200, {}))
+    async with _client(transport) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get("/")
+
+    assert transport.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after():
+    # A long backoff would stall the test; Retry-After: 0 must take precedence
+    transport = ScriptedTransport((429, {"Retry-After": "0"}), (200, {}))
+    async with _client(transport, backoff=60.0, max_backoff=60.0) as client:
+        response = await client.get("/")
+
+    assert response.status_code == 200
+    assert transport.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_returns_response_when_retry_after_exceeds_max_backoff():
+    transport = ScriptedTransport((503, {"Retry-After": "120"}), (200, {}))
+    async with _client(transport, max_backoff=5.0) as client:
+        response = await client.get("/")
+
+    assert response.status_code == 503
+    assert transport.calls == 1
+
+
+class RefusingBackend(httpcore.AsyncNetworkBackend):
+    """Network backend whose every connection attempt is refused."""
+
+    def __init__(self):
+        self.attempts = 0
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, **kwargs):
+        self.attempts += 1
+        raise httpcore.ConnectError("connection refused")
+
+    async def sleep(self, seconds: float) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_unreachable_host_is_only_retried_by_the_connection_pool():
+    client = get_shared_async_client()
+    backend = RefusingBackend()
+    client._transport._transport._pool._network_backend = backend
+    try:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("http://unreachable.test/")
+    finally:
+        await close_shared_async_client()
+
+    assert backend.attempts == 1 + settings.http_connect_retries
+
+
+def test_each_event_loop_gets_its_own_clients():
+    async def clients():
+        return get_shared_async_client(), get_shared_async_client(retries=False)
+
+    # The first loop's clients are still open when the second loop asks
+    first, second = asyncio.run(clients()), asyncio.run(clients())
+
+    assert first[0] is not second[0]
+    assert first[1] is not second[1]
+
+    async def close():
+        for client in first + second:
+            await client.aclose()
+
+    asyncio.run(close())
+
+
+@pytest.mark.asyncio
+async def test_clients_share_a_pool_and_are_rebuilt_after_close():
+    client = get_shared_async_client()
+    assert get_shared_async_client() is client
+    # The client without retries goes straight to the retrying one's pool
+    assert (
+        get_shared_async_client(retries=False)._transport
+        is client._transport._transport
+    )
+
+    await close_shared_async_client()
+
+    rebuilt = get_shared_async_client()
+    assert rebuilt is not client
+    assert not rebuilt.is_closed
+    await close_shared_async_client()
@@ -0,0 +1,138 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from langchain_mcp_adapters.interceptors import MCPToolCallRequest
+
+from megamind.clients import mcp_client_manager
+from megamind.clients.mcp_client_manager import McpClientManager
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+        self._kill = None
+
+    async def call_tool(self, name, args):
+        self.calls.append((name, args))
+        return "live"
+
+    def kill(self):
+        """Make the session's transport fail, as when the server process exits."""
+        self._kill()
+
+
+class FakeClient:
+    def __init__(self, open_delay: float = 0.0):
+        self.open_delay = open_delay
+        self.opened: list[FakeSession] = []
+        self.connections = {"erpnext": {"transport": "stdio"}}
+
+    @asynccontextmanager
+    async def session(self, server_name):
+        await asyncio.sleep(self.open_delay)
+        session = FakeSession()
+        self.opened.append(session)
+        task = asyncio.current_task()
+        died = False
+
+        def kill():
+            nonlocal died
+            died = True
+            task.cancel()
+
+        session._kill = kill
+        try:
+            yield session
+        except asyncio.CancelledError:
+            if not died:
+                raise
+            task.uncancel()
+            raise ConnectionError("server exited")
+
+
+def _manager(client: FakeClient) -> McpClientManager:
+    manager = McpClientManager()
+    manager._client = client
+    manager._server_names = ("erpnext",)
+    manager._is_initialized = True
+    return manager
+
+
+def _request(name: str = "get_document") -> MCPToolCallRequest:
+    return MCPToolCallRequest(
+        name=name, args={"doctype": "Item"}, server_name="erpnext"
+    )
+
+
+async def _per_call_handler(request):
+    return "per-call"
+
+
+@pytest.fixture(autouse=True)
+def fast_reopen(monkeypatch):
+    monkeypatch.setattr(mcp_client_manager, "_SESSION_REOPEN_DELAY", 0.01)
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_use_the_persistent_session():
+    manager = _manager(FakeClient())
+    await manager._open_sessions()
+
+    result = await manager._call_on_live_session(_request(), _per_call_handler)
+
+    assert result == "live"
+    assert manager._client.opened[0].calls == [("get_document", {"doctype": "Item"})]
+    await manager._close_sessions()
+
+
+@pytest.mark.asyncio
+async def test_dead_session_is_reopened_and_used_by_existing_tools():
+    client = FakeClient()
+    manager = _manager(client)
+    await manager._open_sessions()
+
+    client.opened[0].kill()
+    await asyncio.sleep(0)
+    # While the session is down, calls fall back to per-call sessions
+    assert await manager._call_on_live_session(_request(), _per_call_handler) == (
+        "per-call"
+    )
+
+    await asyncio.sleep(0.05)
+    assert len(client.opened) == 2
+    assert await manager._call_on_live_session(_request(), _per_call_handler) == (
+        "live"
+    )
+    assert client.opened[1].calls
+    await manager._close_sessions()
+
+
+@pytest.mark.asyncio
+async def test_slow_server_does_not_block_startup(monkeypatch):
+    monkeypatch.setattr(mcp_client_manager.settings, "mcp_session_open_timeout", 0.01)
+    client = FakeClient(open_delay=0.2)
+    manager = _manager(client)
+
+    await asyncio.wait_for(manager._open_sessions(), timeout=0.1)
+    assert await manager._call_on_live_session(_request(), _per_call_handler) == (
+        "per-call"
+    )
+
+    await asyncio.sleep(0.3)
+    assert await manager._call_on_live_session(_request(), _per_call_handler) == (
+        "live"
+    )
+    await manager._close_sessions()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_stops_sessions():
+    client = FakeClient()
+    manager = _manager(client)
+    await manager._open_sessions()
+
+    await manager._close_sessions()
+
+    assert manager._sessions == {}
+    assert manager._session_tasks == {}
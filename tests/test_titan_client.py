@@ -0,0 +1,75 @@
+import httpx
+import pytest
+
+from megamind.clients import titan_client
+from megamind.clients.titan_client import TitanClient
+from megamind.utils.config import settings
+
+
+class Titan:
+    """Serves knowledge entries until it is told to fail."""
+
+    def __init__(self):
+        self.failure = None
+        self.calls = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if isinstance(self.failure, Exception):
+            raise self.failure
+        if self.failure is not None:
+            return httpx.Response(self.failure, request=request)
+        return httpx.Response(200, json={"id": 1}, request=request)
+
+
+@pytest.fixture
+def titan(monkeypatch, clock):
+    titan = Titan()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(titan.handle))
+    monkeypatch.setattr(titan_client, "get_shared_async_client", lambda: client)
+    titan_client._knowledge_cache.invalidate()
+    yield titan
+    titan_client._knowledge_cache.invalidate()
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_from_cache(titan):
+    client = TitanClient()
+
+    assert await client.get_knowledge_by_id(1) == {"id": 1}
+    assert await client.get_knowledge_by_id(1) == {"id": 1}
+
+    assert titan.calls == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failure", [503, httpx.ConnectError("refused")])
+async def test_expired_entry_is_served_while_titan_is_down(titan, clock, failure):
+    client = TitanClient()
+    await client.get_knowledge_by_id(1)
+
+    clock.now += settings.titan_cache_ttl + 1
+    titan.failure = failure
+
+    assert await client.get_knowledge_by_id(1) == {"id": 1}
+    assert titan.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_masked_by_stale_entries(titan, clock):
+    client = TitanClient()
+    await client.get_knowledge_by_id(1)
+
+    clock.now += settings.titan_cache_ttl + 1
+    titan.failure = 404
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_knowledge_by_id(1)
+
+
+@pytest.mark.asyncio
+async def test_failure_without_cached_entry_is_raised(titan):
+    titan.failure = 503
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await TitanClient().get_knowledge_by_id(1)
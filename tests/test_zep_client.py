@@ -0,0 +1,255 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from zep_cloud.core.api_error import ApiError
+
+from megamind.clients import zep_client
+from megamind.clients.circuit_breaker import CircuitOpenError
+from megamind.clients.http_pool import close_shared_async_client
+from megamind.clients.zep_client import ZepClient
+from megamind.utils.config import settings
+
+
+class Model(dict):
+    """Stands in for a pydantic response model of the Zep SDK."""
+
+    def model_dump(self, **kwargs) -> dict:
+        return dict(self)
+
+
+@pytest.fixture
+def sdk(monkeypatch):
+    sdk = SimpleNamespace(
+        user=SimpleNamespace(
+            get=AsyncMock(), add=AsyncMock(), delete=AsyncMock(), warm=AsyncMock()
+        ),
+        thread=SimpleNamespace(
+            get=AsyncMock(return_value=SimpleNamespace(messages=[])),
+            create=AsyncMock(),
+            add_messages=AsyncMock(),
+        ),
+        graph=SimpleNamespace(search=AsyncMock()),
+    )
+    monkeypatch.setattr(zep_client, "AsyncZep", lambda **kwargs: sdk)
+    return sdk
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(zep_client, "_BACKOFF_BASE", 0.0)
+
+
+@pytest_asyncio.fixture
+async def zep(sdk):
+    client = ZepClient(api_key="test")
+    yield client
+    await close_shared_async_client()
+
+
+class TestEnsureThread:
+    @pytest.mark.asyncio
+    async def test_existing_thread_costs_one_call(self, zep, sdk):
+        result = await zep.get_or_create_thread("t1", "u1")
+
+        assert result == {"thread_id": "t1", "user_id": "u1"}
+        assert sdk.thread.get.await_count == 1
+        sdk.thread.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_missing_thread_is_created(self, zep, sdk):
+        sdk.thread.get.side_effect = ApiError(status_code=404, body="not found")
+        sdk.thread.create.return_value = Model(thread_id="t1", user_id="u1")
+
+        result = await zep.get_or_create_thread("t1", "u1")
+
+        assert result == {"thread_id": "t1", "user_id": "u1"}
+        sdk.thread.create.assert_awaited_once_with(thread_id="t1", user_id="u1")
+
+    @pytest.mark.asyncio
+    async def test_other_errors_do_not_create(self, zep, sdk):
+        sdk.thread.get.side_effect = ApiError(status_code=400, body="bad request")
+
+        assert await zep.get_or_create_thread("t1", "u1") is None
+        sdk.thread.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_known_thread_skips_zep(self, zep, sdk):
+        await zep.get_or_create_thread("t1", "u1")
+        await zep.get_or_create_thread("t1", "u1")
+
+        assert sdk.thread.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_thread_is_not_remembered(self, zep, sdk):
+        sdk.thread.get.side_effect = ApiError(status_code=400, body="bad request")
+        await zep.get_or_create_thread("t1", "u1")
+
+        sdk.thread.get.side_effect = None
+        assert await zep.get_or_create_thread("t1", "u1") is not None
+        assert sdk.thread.get.await_count == 2
+
+
+class TestEnsureUsers:
+    @pytest.mark.asyncio
+    async def test_creates_only_missing_users(self, zep, sdk):
+        async def get(user_id):
+            if user_id == "new":
+                raise ApiError(status_code=404, body="not found")
+            return Model(user_id=user_id)
+
+        sdk.user.get.side_effect = get
+        sdk.user.add.return_value = Model(user_id="new")
+
+        users = await zep.ensure_users([{"user_id": "old"}, {"user_id": "new"}])
+
+        assert users == [{"user_id": "old"}, {"user_id": "new"}]
+        assert sdk.user.get.await_count == 2
+        sdk.user.add.assert_awaited_once()
+        assert sdk.user.add.await_args.kwargs["user_id"] == "new"
+
+    @pytest.mark.asyncio
+    async def test_failed_creation_yields_none(self, zep, sdk):
+        sdk.user.get.side_effect = ApiError(status_code=404, body="not found")
+        sdk.user.add.side_effect = ApiError(status_code=400, body="bad request")
+
+        assert await zep.ensure_users([{"user_id": "u1"}]) == [None]
+
+
+class TestKnownUsers:
+    @pytest.mark.asyncio
+    async def test_known_user_skips_zep(self, zep, sdk):
+        sdk.user.get.return_value = Model(user_id="u1")
+
+        assert await zep.get_or_create_user("u1") == {"user_id": "u1"}
+        assert await zep.get_or_create_user("u1") == {"user_id": "u1"}
+
+        assert sdk.user.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_deleted_user_is_forgotten(self, zep, sdk):
+        sdk.user.get.return_value = Model(user_id="u1")
+        await zep.get_or_create_user("u1")
+
+        await zep.delete_user("u1")
+        await zep.get_or_create_user("u1")
+
+        assert sdk.user.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_caps_concurrent_zep_calls(monkeypatch, sdk):
+    monkeypatch.setattr(settings, "zep_max_concurrency", 2)
+    zep = ZepClient(api_key="test")
+    running = peak = 0
+
+    async def search(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    try:
+        await asyncio.gather(*(zep._call(search) for _ in range(5)))
+    finally:
+        await close_shared_async_client()
+
+    assert peak == 2
+
+
+class TestRetries:
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, zep, sdk):
+        sdk.user.get.side_effect = [
+            ApiError(status_code=503, body="unavailable"),
+            Model(user_id="u1"),
+        ]
+
+        assert await zep.get_user("u1") == {"user_id": "u1"}
+        assert sdk.user.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, zep, sdk):
+        sdk.user.get.side_effect = ApiError(status_code=503, body="unavailable")
+
+        assert await zep.get_user("u1") is None
+        assert sdk.user.get.await_count == 1 + settings.zep_max_retries
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_permanent_errors(self, zep, sdk):
+        sdk.user.get.side_effect = ApiError(status_code=404, body="not found")
+
+        assert await zep.get_user("u1") is None
+        assert sdk.user.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_does_not_replay_writes_on_server_errors(self, zep, sdk):
+        sdk.thread.create.side_effect = ApiError(status_code=500, body="error")
+
+        assert await zep.create_thread("t1", "u1") is None
+        assert sdk.thread.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limited_writes(self, zep, sdk):
+        sdk.thread.create.side_effect = [
+            ApiError(status_code=429, body="slow down"),
+            Model(thread_id="t1", user_id="u1"),
+        ]
+
+        assert await zep.create_thread("t1", "u1") == {
+            "thread_id": "t1",
+            "user_id": "u1",
+        }
+        assert sdk.thread.create.await_count == 2
+
+
+class TestCircuitBreaker:
+    @pytest.fixture(autouse=True)
+    def no_retries(self, monkeypatch):
+        monkeypatch.setattr(settings, "zep_max_retries", 0)
+
+    @pytest.mark.asyncio
+    async def test_opens_after_repeated_server_errors(self, zep, sdk, clock):
+        sdk.user.get.side_effect = ApiError(status_code=503, body="unavailable")
+        for _ in range(5):
+            with pytest.raises(ApiError):
+                await zep._call(sdk.user.get, user_id="u1")
+
+        with pytest.raises(CircuitOpenError):
+            await zep._call(sdk.user.get, user_id="u1")
+        assert sdk.user.get.await_count == 5
+
+        # Once the reset window has passed, calls reach Zep again
+        clock.now += 31.0
+        sdk.user.get.side_effect = None
+        await zep._call(sdk.user.get, user_id="u1")
+        assert sdk.user.get.await_count == 6
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_it(self, zep, sdk, clock):
+        sdk.user.get.side_effect = ApiError(status_code=404, body="not found")
+        for _ in range(10):
+            with pytest.raises(ApiError):
+                await zep._call(sdk.user.get, user_id="u1")
+
+        assert sdk.user.get.await_count == 10
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_call(zep, sdk):
+    release = asyncio.Event()
+
+    async def get(user_id):
+        await release.wait()
+        return Model(user_id=user_id)
+
+    sdk.user.get.side_effect = get
+    readers = [asyncio.create_task(zep.get_user("u1")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*readers) == [{"user_id": "u1"}] * 3
+    assert sdk.user.get.await_count == 1